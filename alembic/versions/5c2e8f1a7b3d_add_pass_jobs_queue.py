@@ -0,0 +1,83 @@
+"""add pass_jobs work queue
+
+Revision ID: 5c2e8f1a7b3d
+Revises: 0d0c4c450691
+Create Date: 2026-02-12
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8f1a7b3d"
+down_revision: Union[str, None] = "0d0c4c450691"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per (satellite, time chunk) of a generation window.
+    # window_* is the full run window: it decides clipping and the
+    # "pass already in progress at window start" rule for the first chunk.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS pass_jobs (
+            id            BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            satellite_id  BIGINT NOT NULL REFERENCES satellites(id) ON DELETE CASCADE,
+            window_start  TIMESTAMPTZ NOT NULL,
+            window_end    TIMESTAMPTZ NOT NULL,
+            chunk_start   TIMESTAMPTZ NOT NULL,
+            chunk_end     TIMESTAMPTZ NOT NULL,
+            status        TEXT NOT NULL DEFAULT 'pending',
+            attempts      INTEGER NOT NULL DEFAULT 0,
+            worker        TEXT,
+            claimed_at    TIMESTAMPTZ,
+            heartbeat_at  TIMESTAMPTZ,
+            finished_at   TIMESTAMPTZ,
+            passes        INTEGER,
+            last_error    TEXT,
+            created_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT ck_pass_jobs_status CHECK (status IN ('pending', 'running', 'done', 'failed')),
+            CONSTRAINT ck_pass_jobs_chunk CHECK (chunk_start < chunk_end),
+            CONSTRAINT uq_pass_jobs_sat_chunk UNIQUE (satellite_id, chunk_start, chunk_end)
+        );
+    """)
+
+    # claim path: oldest pending job first
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_pass_jobs_pending
+        ON pass_jobs (id)
+        WHERE status = 'pending';
+    """)
+
+    # stale-job sweep: running jobs by heartbeat
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_pass_jobs_running_heartbeat
+        ON pass_jobs (heartbeat_at)
+        WHERE status = 'running';
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE VIEW pass_jobs_progress AS
+        SELECT
+            window_start,
+            window_end,
+            COUNT(*)                                      AS jobs,
+            COUNT(*) FILTER (WHERE status = 'pending')    AS pending,
+            COUNT(*) FILTER (WHERE status = 'running')    AS running,
+            COUNT(*) FILTER (WHERE status = 'done')       AS done,
+            COUNT(*) FILTER (WHERE status = 'failed')     AS failed,
+            COALESCE(SUM(passes), 0)                      AS passes,
+            COUNT(DISTINCT worker)                        AS workers,
+            MIN(claimed_at)                               AS first_claimed_at,
+            MAX(finished_at)                              AS last_finished_at,
+            ROUND(100.0 * COUNT(*) FILTER (WHERE status = 'done') / COUNT(*), 1) AS pct_done
+        FROM pass_jobs
+        GROUP BY window_start, window_end;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS pass_jobs_progress;")
+    op.execute("DROP TABLE IF EXISTS pass_jobs;")
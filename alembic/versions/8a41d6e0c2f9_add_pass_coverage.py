@@ -0,0 +1,37 @@
+"""add pass_coverage for incremental generation
+
+Revision ID: 8a41d6e0c2f9
+Revises: 5c2e8f1a7b3d
+Create Date: 2026-02-13
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8a41d6e0c2f9"
+down_revision: Union[str, None] = "5c2e8f1a7b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Time range already generated for a satellite with a given TLE.
+    # generate_passes_7d_batched --incremental only computes what lies outside it.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS pass_coverage (
+            satellite_id   BIGINT NOT NULL REFERENCES satellites(id) ON DELETE CASCADE,
+            tle_id         BIGINT NOT NULL REFERENCES tles(id) ON DELETE CASCADE,
+            covered_start  TIMESTAMPTZ NOT NULL,
+            covered_end    TIMESTAMPTZ NOT NULL,
+            updated_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT pk_pass_coverage PRIMARY KEY (satellite_id, tle_id),
+            CONSTRAINT ck_pass_coverage_range CHECK (covered_start < covered_end)
+        );
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS pass_coverage;")
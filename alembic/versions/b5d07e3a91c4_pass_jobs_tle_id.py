@@ -0,0 +1,43 @@
+"""pass_jobs: pin the TLE a job was planned with
+
+Revision ID: b5d07e3a91c4
+Revises: f2a8c61d0b47
+Create Date: 2026-02-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d07e3a91c4"
+down_revision: Union[str, None] = "f2a8c61d0b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every chunk of a satellite's window is propagated from the TLE that was
+    # current when the window was planned, not whatever is newest when a worker
+    # picks the chunk up (a mid-plan fetch would otherwise mix element sets).
+    op.execute("ALTER TABLE pass_jobs ADD COLUMN IF NOT EXISTS tle_id BIGINT REFERENCES tles(id) ON DELETE CASCADE;")
+
+    # Jobs planned before this column existed: pin them to the satellite's latest TLE
+    op.execute("""
+        UPDATE pass_jobs j
+        SET tle_id = t.id
+        FROM (
+            SELECT DISTINCT ON (satellite_id) satellite_id, id
+            FROM tles
+            ORDER BY satellite_id, fetched_at DESC
+        ) t
+        WHERE t.satellite_id = j.satellite_id
+          AND j.tle_id IS NULL
+    """)
+    op.execute("DELETE FROM pass_jobs WHERE tle_id IS NULL;")
+    op.execute("ALTER TABLE pass_jobs ALTER COLUMN tle_id SET NOT NULL;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE pass_jobs DROP COLUMN IF EXISTS tle_id;")
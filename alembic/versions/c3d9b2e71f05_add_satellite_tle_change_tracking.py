@@ -0,0 +1,43 @@
+"""add satellite tle change tracking
+
+Revision ID: c3d9b2e71f05
+Revises: 8a41d6e0c2f9
+Create Date: 2026-02-14
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d9b2e71f05"
+down_revision: Union[str, None] = "8a41d6e0c2f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tle_changed_at: set by fetch_tles when a new TLE row is stored
+    # passes_generated_at: set by the generator after a satellite's passes are written
+    op.execute("ALTER TABLE satellites ADD COLUMN IF NOT EXISTS tle_changed_at TIMESTAMPTZ;")
+    op.execute("ALTER TABLE satellites ADD COLUMN IF NOT EXISTS passes_generated_at TIMESTAMPTZ;")
+
+    # Backfill from stored TLEs (safe even if tables are empty);
+    # passes_generated_at stays NULL, so every satellite counts as changed once.
+    op.execute("""
+        UPDATE satellites s
+        SET tle_changed_at = t.last_fetched
+        FROM (
+            SELECT satellite_id, MAX(fetched_at) AS last_fetched
+            FROM tles
+            GROUP BY satellite_id
+        ) t
+        WHERE t.satellite_id = s.id
+          AND s.tle_changed_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE satellites DROP COLUMN IF EXISTS passes_generated_at;")
+    op.execute("ALTER TABLE satellites DROP COLUMN IF EXISTS tle_changed_at;")
@@ -0,0 +1,30 @@
+"""passes: pass_start marks the segments of a split pass
+
+Revision ID: d3f6a9b2c814
+Revises: b5d07e3a91c4
+Create Date: 2026-02-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f6a9b2c814"
+down_revision: Union[str, None] = "b5d07e3a91c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Passes longer than PASS_MAX_DURATION_S are stored as back-to-back segments
+    # (app/db/pass_writer.py); each segment records the pass's rise time so job
+    # chunks and incremental tails replace whole passes by the time they rose,
+    # not the segments that happen to start in their range. NULL = not split.
+    # Nullable with no default: a metadata-only change, no partition rewrite.
+    op.execute("ALTER TABLE passes ADD COLUMN IF NOT EXISTS pass_start TIMESTAMPTZ;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE passes DROP COLUMN IF EXISTS pass_start;")
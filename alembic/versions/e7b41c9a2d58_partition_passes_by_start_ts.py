@@ -0,0 +1,152 @@
+"""partition passes by start_ts (daily)
+
+Revision ID: e7b41c9a2d58
+Revises: c3d9b2e71f05
+Create Date: 2026-02-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b41c9a2d58"
+down_revision: Union[str, None] = "c3d9b2e71f05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# days created ahead of today by the migration; afterwards
+# app.scripts.maintain_pass_partitions keeps the horizon ahead of generation
+INITIAL_AHEAD_DAYS = 14
+
+_OLD_INDEXES = [
+    "passes_pkey",
+    "uq_passes_sat_gs_start_end",
+    "ix_passes_gs_start",
+    "ix_passes_sat_start",
+    "ix_passes_gs_end",
+    "ix_passes_gs_window_gist",
+]
+
+
+def _rename_indexes(suffix_from: str, suffix_to: str) -> None:
+    for name in _OLD_INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name}{suffix_from} RENAME TO {name}{suffix_to};")
+
+
+def upgrade() -> None:
+    # Existing heap moves aside (index names are schema-wide, so they move too)
+    op.execute("ALTER TABLE passes RENAME TO passes_unpartitioned;")
+    _rename_indexes("", "_unpartitioned")
+
+    # Partition key must be part of every unique constraint: PK becomes (id, start_ts);
+    # the dedupe key (satellite_id, ground_station_id, start_ts, end_ts) already has it.
+    # id moves from IDENTITY to a plain sequence default (set below).
+    op.execute("""
+        CREATE TABLE passes (
+            id                BIGINT NOT NULL,
+            satellite_id      BIGINT NOT NULL REFERENCES satellites(id) ON DELETE CASCADE,
+            ground_station_id BIGINT NOT NULL REFERENCES ground_stations(id) ON DELETE CASCADE,
+            start_ts          TIMESTAMPTZ NOT NULL,
+            end_ts            TIMESTAMPTZ NOT NULL,
+            duration_s        INTEGER NOT NULL,
+            max_elev_deg      DOUBLE PRECISION NOT NULL,
+            CONSTRAINT passes_pkey PRIMARY KEY (id, start_ts),
+            CONSTRAINT uq_passes_sat_gs_start_end UNIQUE (satellite_id, ground_station_id, start_ts, end_ts),
+            CONSTRAINT ck_passes_end_after_start CHECK (end_ts > start_ts),
+            CONSTRAINT ck_passes_duration_nonneg CHECK (duration_s >= 0)
+        ) PARTITION BY RANGE (start_ts);
+    """)
+
+    # Safety net: rows outside every daily partition land here instead of failing the insert.
+    # The maintenance script moves them into their day partition when it creates it.
+    op.execute("CREATE TABLE passes_default PARTITION OF passes DEFAULT;")
+
+    # One partition per UTC day from the oldest stored pass to today + INITIAL_AHEAD_DAYS
+    op.execute(f"""
+        DO $$
+        DECLARE
+            d      date;
+            d_last date := (now() AT TIME ZONE 'UTC')::date + {INITIAL_AHEAD_DAYS};
+        BEGIN
+            SELECT COALESCE(min((start_ts AT TIME ZONE 'UTC')::date), (now() AT TIME ZONE 'UTC')::date)
+            INTO d
+            FROM passes_unpartitioned;
+
+            WHILE d <= d_last LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF passes FOR VALUES FROM (%L) TO (%L)',
+                    'passes_p' || to_char(d, 'YYYYMMDD'),
+                    (d::timestamp AT TIME ZONE 'UTC'),
+                    ((d + 1)::timestamp AT TIME ZONE 'UTC')
+                );
+                d := d + 1;
+            END LOOP;
+        END
+        $$;
+    """)
+
+    op.execute("""
+        INSERT INTO passes (id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg)
+        SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+        FROM passes_unpartitioned;
+    """)
+    # drops the old identity sequence (passes_id_seq) with it
+    op.execute("DROP TABLE passes_unpartitioned;")
+
+    # Indexes on the parent cascade to every partition (existing and future); built after the copy
+    op.execute("CREATE INDEX ix_passes_gs_start ON passes (ground_station_id, start_ts);")
+    op.execute("CREATE INDEX ix_passes_sat_start ON passes (satellite_id, start_ts);")
+    op.execute("CREATE INDEX ix_passes_gs_end ON passes (ground_station_id, end_ts);")
+    op.execute("""
+        CREATE INDEX ix_passes_gs_window_gist
+        ON passes
+        USING GIST (ground_station_id, tstzrange(start_ts, end_ts, '[)'));
+    """)
+
+    op.execute("CREATE SEQUENCE passes_id_seq AS BIGINT OWNED BY passes.id;")
+    op.execute("SELECT setval('passes_id_seq', COALESCE((SELECT max(id) FROM passes), 0) + 1, false);")
+    op.execute("ALTER TABLE passes ALTER COLUMN id SET DEFAULT nextval('passes_id_seq');")
+    op.execute("ANALYZE passes;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE passes RENAME TO passes_partitioned;")
+    _rename_indexes("", "_partitioned")
+    op.execute("ALTER SEQUENCE passes_id_seq RENAME TO passes_partitioned_id_seq;")
+
+    op.execute("""
+        CREATE TABLE passes (
+            id                BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            satellite_id      BIGINT NOT NULL REFERENCES satellites(id) ON DELETE CASCADE,
+            ground_station_id BIGINT NOT NULL REFERENCES ground_stations(id) ON DELETE CASCADE,
+            start_ts          TIMESTAMPTZ NOT NULL,
+            end_ts            TIMESTAMPTZ NOT NULL,
+            duration_s        INTEGER NOT NULL,
+            max_elev_deg      DOUBLE PRECISION NOT NULL,
+            CONSTRAINT passes_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_passes_sat_gs_start_end UNIQUE (satellite_id, ground_station_id, start_ts, end_ts),
+            CONSTRAINT ck_passes_end_after_start CHECK (end_ts > start_ts),
+            CONSTRAINT ck_passes_duration_nonneg CHECK (duration_s >= 0)
+        );
+    """)
+    op.execute("""
+        INSERT INTO passes (id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg)
+        SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+        FROM passes_partitioned;
+    """)
+    op.execute("SELECT setval(pg_get_serial_sequence('passes', 'id'), COALESCE((SELECT max(id) FROM passes), 0) + 1, false);")
+
+    op.execute("CREATE INDEX ix_passes_gs_start ON passes (ground_station_id, start_ts);")
+    op.execute("CREATE INDEX ix_passes_sat_start ON passes (satellite_id, start_ts);")
+    op.execute("CREATE INDEX ix_passes_gs_end ON passes (ground_station_id, end_ts);")
+    op.execute("""
+        CREATE INDEX ix_passes_gs_window_gist
+        ON passes
+        USING GIST (ground_station_id, tstzrange(start_ts, end_ts, '[)'));
+    """)
+
+    # drops every partition and the sequence owned by its id column
+    op.execute("DROP TABLE passes_partitioned;")
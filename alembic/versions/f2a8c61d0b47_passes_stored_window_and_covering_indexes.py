@@ -0,0 +1,73 @@
+"""passes: stored pass_window tstzrange, GiST on it, covering btree indexes
+
+Revision ID: f2a8c61d0b47
+Revises: e7b41c9a2d58
+Create Date: 2026-02-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a8c61d0b47"
+down_revision: Union[str, None] = "e7b41c9a2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ("window" is a reserved word in Postgres, hence pass_window)
+    # Stored, so the GiST index and range checks read a column instead of
+    # re-evaluating tstzrange(start_ts, end_ts) per heap row. Rewrites every partition.
+    op.execute("""
+        ALTER TABLE passes
+        ADD COLUMN IF NOT EXISTS pass_window TSTZRANGE
+        GENERATED ALWAYS AS (tstzrange(start_ts, end_ts, '[)')) STORED;
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_passes_gs_pass_window_gist
+        ON passes
+        USING GIST (ground_station_id, pass_window);
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_passes_gs_window_gist;")
+
+    # Covering btrees: every column the API selects (and pass_window for the
+    # overlap filter) is in the index, so /passes (ORDER BY start_ts) and the
+    # schedule endpoints (ORDER BY end_ts) can run as index-only scans.
+    # They supersede the plain (ground_station_id, start_ts / end_ts) indexes.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_passes_gs_start_cover
+        ON passes (ground_station_id, start_ts)
+        INCLUDE (end_ts, id, satellite_id, duration_s, max_elev_deg, pass_window);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_passes_gs_end_cover
+        ON passes (ground_station_id, end_ts)
+        INCLUDE (start_ts, id, satellite_id, duration_s, max_elev_deg, pass_window);
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_passes_gs_start;")
+    op.execute("DROP INDEX IF EXISTS ix_passes_gs_end;")
+
+    # planner statistics; index-only scans also need the visibility map, which
+    # only VACUUM sets (not allowed inside the migration transaction): run
+    # `VACUUM (ANALYZE) passes;` afterwards
+    op.execute("ANALYZE passes;")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_passes_gs_start ON passes (ground_station_id, start_ts);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_passes_gs_end ON passes (ground_station_id, end_ts);")
+    op.execute("DROP INDEX IF EXISTS ix_passes_gs_end_cover;")
+    op.execute("DROP INDEX IF EXISTS ix_passes_gs_start_cover;")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_passes_gs_window_gist
+        ON passes
+        USING GIST (ground_station_id, tstzrange(start_ts, end_ts, '[)'));
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_passes_gs_pass_window_gist;")
+
+    op.execute("ALTER TABLE passes DROP COLUMN IF EXISTS pass_window;")
@@ -13,3 +13,17 @@ if DATABASE_URL.startswith("postgresql://"):
     SQLALCHEMY_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
 else:
     SQLALCHEMY_DATABASE_URL = DATABASE_URL
+
+# Connection pool (app/db/conn.py). One pool per process; the API opens it at
+# startup and waits for DB_POOL_MIN_SIZE connections, scripts open it lazily.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT_S = float(os.getenv("DB_POOL_TIMEOUT_S", "5"))            # wait for a free connection
+DB_POOL_MAX_LIFETIME_S = float(os.getenv("DB_POOL_MAX_LIFETIME_S", "1800"))  # recycle connections after this
+DB_POOL_MAX_IDLE_S = float(os.getenv("DB_POOL_MAX_IDLE_S", "300"))          # shrink back to min_size
+DB_CONNECT_TIMEOUT_S = int(os.getenv("DB_CONNECT_TIMEOUT_S", "3"))
+
+# passes is partitioned on start_ts; window queries also bound start_ts so only
+# the partitions that can hold overlapping passes are scanned. A pass that
+# started more than this before the window is not returned.
+PASS_MAX_DURATION_S = int(os.getenv("PASS_MAX_DURATION_S", "86400"))
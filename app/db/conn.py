@@ -1,23 +1,151 @@
-import psycopg
-from contextlib import contextmanager
-from app.core.config import DATABASE_URL
+import asyncio
+import atexit
+import os
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from app.core.config import (
+    DATABASE_URL,
+    DB_CONNECT_TIMEOUT_S,
+    DB_POOL_MAX_IDLE_S,
+    DB_POOL_MAX_LIFETIME_S,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT_S,
+)
+
+
+_pool: ConnectionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+# API side: async pool bound to the server's event loop (opened in the lifespan hook)
+_apool: AsyncConnectionPool | None = None
+_apool_lock: asyncio.Lock | None = None
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "kwargs": {"connect_timeout": DB_CONNECT_TIMEOUT_S},
+        "min_size": DB_POOL_MIN_SIZE,
+        "max_size": max(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+        "timeout": DB_POOL_TIMEOUT_S,
+        "max_lifetime": DB_POOL_MAX_LIFETIME_S,
+        "max_idle": DB_POOL_MAX_IDLE_S,
+        "open": False,
+    }
+
+
+def _new_pool() -> ConnectionPool:
+    # check: cheap round trip before handing out a connection; dead ones are replaced
+    return ConnectionPool(DATABASE_URL, check=ConnectionPool.check_connection, name="dg", **_pool_kwargs())
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Process-wide pool, opened on first use. A forked child (process pool
+    workers) gets its own pool instead of the parent's sockets, and a pool
+    closed by a failed warm-up is replaced.
+    """
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid() and not _pool.closed:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid() or _pool.closed:
+            pool = _new_pool()
+            pool.open()
+            _pool, _pool_pid = pool, os.getpid()
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool, _pool_pid = None, None
+
+
+atexit.register(close_pool)
+
+
+def _stats(pool) -> dict:
+    """Pool gauges and counters (psycopg_pool get_stats) plus the configured limits."""
+    return {
+        "name": pool.name,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "max_lifetime_s": DB_POOL_MAX_LIFETIME_S,
+        "max_idle_s": DB_POOL_MAX_IDLE_S,
+        "timeout_s": DB_POOL_TIMEOUT_S,
+        **pool.get_stats(),
+    }
 
 
 @contextmanager
 def get_conn():
-    conn = psycopg.connect(DATABASE_URL, connect_timeout=3)
-    try:
+    # pool.connection() commits on success, rolls back on error, then returns the connection
+    with get_pool().connection() as conn:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
-
-
-def check_db() -> None:
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SELECT 1;")
-            cur.fetchone()
+
+
+# ---- async (API) ----
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """
+    Async counterpart of get_pool for the running event loop; opened on first
+    use if the lifespan hook did not already, replaced if a warm-up closed it.
+    """
+    global _apool, _apool_lock
+    if _apool is not None and not _apool.closed:
+        return _apool
+    if _apool_lock is None:
+        _apool_lock = asyncio.Lock()
+    async with _apool_lock:
+        if _apool is None or _apool.closed:
+            pool = AsyncConnectionPool(
+                DATABASE_URL, check=AsyncConnectionPool.check_connection, name="dg-async", **_pool_kwargs()
+            )
+            await pool.open()
+            _apool = pool
+        return _apool
+
+
+async def open_async_pool(wait: bool = True) -> AsyncConnectionPool:
+    """
+    Open the pool now; with wait, block until min_size connections are ready
+    (startup warm-up). On timeout psycopg_pool closes the pool and raises
+    PoolTimeout; the next get_aconn starts a fresh one.
+    """
+    pool = await get_async_pool()
+    if wait:
+        await pool.wait(timeout=DB_POOL_TIMEOUT_S)
+    return pool
+
+
+async def close_async_pool() -> None:
+    global _apool, _apool_lock
+    if _apool is not None:
+        await _apool.close()
+    _apool, _apool_lock = None, None
+
+
+async def async_pool_stats() -> dict:
+    return _stats(await get_async_pool())
+
+
+@asynccontextmanager
+async def get_aconn():
+    # same transaction semantics as get_conn
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+async def check_db_async() -> None:
+    async with get_aconn() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT 1;")
+            await cur.fetchone()
@@ -1,7 +1,8 @@
 from sqlalchemy import (
     BigInteger, Integer, Float, Text, ForeignKey,
-    DateTime, func, Index
+    DateTime, func, Index, UniqueConstraint, Computed
 )
+from sqlalchemy.dialects.postgresql import TSTZRANGE
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -18,6 +19,10 @@ class Satellite(Base):
 
     created_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # change tracking: fetch_tles bumps tle_changed_at, the generator sets passes_generated_at
+    tle_changed_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+    passes_generated_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+
     tles = relationship("TLE", back_populates="satellite", cascade="all, delete-orphan")
 
 
@@ -50,19 +55,91 @@ class GroundStation(Base):
 
 
 class Pass(Base):
+    """Range-partitioned by start_ts (one partition per UTC day, see app/db/partitions.py)."""
     __tablename__ = "passes"
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     satellite_id: Mapped[int] = mapped_column(ForeignKey("satellites.id", ondelete="CASCADE"), nullable=False)
     ground_station_id: Mapped[int] = mapped_column(ForeignKey("ground_stations.id", ondelete="CASCADE"), nullable=False)
 
-    start_ts: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    # part of the primary key: unique constraints on a partitioned table must include the partition key
+    start_ts: Mapped[object] = mapped_column(DateTime(timezone=True), primary_key=True)
     end_ts: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
 
     duration_s: Mapped[int] = mapped_column(Integer, nullable=False)
     max_elev_deg: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
 
+    # rise time of the pass this row is a segment of; NULL unless the pass was
+    # longer than PASS_MAX_DURATION_S and split (app/db/pass_writer.py)
+    pass_start: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # stored tstzrange(start_ts, end_ts, '[)') for overlap queries ("window" is reserved)
+    pass_window: Mapped[object] = mapped_column(
+        TSTZRANGE, Computed("tstzrange(start_ts, end_ts, '[)')", persisted=True), nullable=True
+    )
+
     __table_args__ = (
-        Index("ix_passes_gs_start", "ground_station_id", "start_ts"),
+        Index(
+            "ix_passes_gs_start_cover",
+            "ground_station_id",
+            "start_ts",
+            postgresql_include=["end_ts", "id", "satellite_id", "duration_s", "max_elev_deg", "pass_window"],
+        ),
+        Index(
+            "ix_passes_gs_end_cover",
+            "ground_station_id",
+            "end_ts",
+            postgresql_include=["start_ts", "id", "satellite_id", "duration_s", "max_elev_deg", "pass_window"],
+        ),
         Index("ix_passes_sat_start", "satellite_id", "start_ts"),
+        Index("ix_passes_gs_pass_window_gist", "ground_station_id", "pass_window", postgresql_using="gist"),
+    )
+
+
+class PassCoverage(Base):
+    """Time range already generated for a satellite with a given TLE (incremental generation)."""
+    __tablename__ = "pass_coverage"
+
+    satellite_id: Mapped[int] = mapped_column(ForeignKey("satellites.id", ondelete="CASCADE"), primary_key=True)
+    tle_id: Mapped[int] = mapped_column(ForeignKey("tles.id", ondelete="CASCADE"), primary_key=True)
+
+    covered_start: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    covered_end: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class PassJob(Base):
+    """
+    Work-queue row for distributed pass generation: one (satellite, time chunk)
+    of a generation window. Claimed by workers with FOR UPDATE SKIP LOCKED.
+    """
+    __tablename__ = "pass_jobs"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    satellite_id: Mapped[int] = mapped_column(ForeignKey("satellites.id", ondelete="CASCADE"), nullable=False)
+    # TLE current at planning time; every chunk of the window is propagated from it
+    tle_id: Mapped[int] = mapped_column(ForeignKey("tles.id", ondelete="CASCADE"), nullable=False)
+
+    window_start: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    window_end: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    chunk_start: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    chunk_end: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # pending -> running -> done | failed (running -> pending again if the worker dies)
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    worker: Mapped[str] = mapped_column(Text, nullable=True)
+
+    claimed_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    passes: Mapped[int] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("satellite_id", "chunk_start", "chunk_end", name="uq_pass_jobs_sat_chunk"),
     )
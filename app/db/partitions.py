@@ -0,0 +1,141 @@
+"""
+Daily range partitions of passes (on start_ts, UTC days).
+
+Partition for day D is passes_pYYYYMMDD = [D 00:00Z, D+1 00:00Z); rows outside
+every day partition fall into passes_default. Creating partitions ahead of the
+generation horizon keeps the default empty; retention drops whole partitions
+instead of running DELETE.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from psycopg import sql
+
+from app.db.conn import get_conn
+from app.db.pass_writer import STORED_COLUMNS
+
+
+PARTITION_PREFIX = "passes_p"
+DEFAULT_PARTITION = "passes_default"
+
+_COLS = sql.SQL(", ").join(sql.Identifier(c) for c in ("id",) + STORED_COLUMNS)
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    lo = datetime.combine(day, time(0), tzinfo=timezone.utc)
+    return lo, lo + timedelta(days=1)
+
+
+def list_partition_days() -> list[date]:
+    """Days that have a partition, ascending."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'passes'::regclass
+                """
+            )
+            names = [r[0] for r in cur.fetchall()]
+
+    days = []
+    for name in names:
+        if name.startswith(PARTITION_PREFIX) and len(name) == len(PARTITION_PREFIX) + 8:
+            days.append(datetime.strptime(name[len(PARTITION_PREFIX) :], "%Y%m%d").date())
+    return sorted(days)
+
+
+def create_partition(day: date) -> int:
+    """
+    Create the partition for one day. Rows for that day already sitting in the
+    default partition are moved into it (Postgres refuses to attach a range
+    the default partition still holds rows for). Returns the rows moved.
+    """
+    lo, hi = day_bounds(day)
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("SELECT EXISTS (SELECT 1 FROM {} WHERE start_ts >= %s AND start_ts < %s)").format(
+                    sql.Identifier(DEFAULT_PARTITION)
+                ),
+                (lo, hi),
+            )
+            has_rows = cur.fetchone()[0]
+
+            moved = 0
+            if has_rows:
+                cur.execute("CREATE TEMP TABLE pass_partition_move (LIKE passes) ON COMMIT DROP")
+                cur.execute(
+                    sql.SQL(
+                        """
+                        WITH d AS (
+                            DELETE FROM {} WHERE start_ts >= %s AND start_ts < %s
+                            RETURNING {cols}
+                        )
+                        INSERT INTO pass_partition_move ({cols}) SELECT {cols} FROM d
+                        """
+                    ).format(sql.Identifier(DEFAULT_PARTITION), cols=_COLS),
+                    (lo, hi),
+                )
+                moved = cur.rowcount
+
+            cur.execute(
+                sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF passes FOR VALUES FROM ({}) TO ({})").format(
+                    sql.Identifier(partition_name(day)), sql.Literal(lo), sql.Literal(hi)
+                )
+            )
+
+            if has_rows:
+                cur.execute(
+                    sql.SQL("INSERT INTO passes ({cols}) SELECT {cols} FROM pass_partition_move").format(cols=_COLS)
+                )
+            return moved
+
+
+def ensure_partitions(first_day: date, last_day: date) -> list[tuple[date, int]]:
+    """Create missing partitions for [first_day, last_day]. Returns [(day, rows moved from default)]."""
+    existing = set(list_partition_days())
+    created = []
+    day = first_day
+    while day <= last_day:
+        if day not in existing:
+            created.append((day, create_partition(day)))
+        day += timedelta(days=1)
+    return created
+
+
+def drop_partitions_before(cutoff_day: date) -> list[date]:
+    """
+    Drop every day partition older than cutoff_day (its whole range ends on or
+    before cutoff_day 00:00Z), plus default-partition rows in that range.
+    """
+    dropped = []
+    for day in list_partition_days():
+        if day >= cutoff_day:
+            break
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(partition_name(day))))
+        dropped.append(day)
+
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("DELETE FROM {} WHERE start_ts < %s").format(sql.Identifier(DEFAULT_PARTITION)),
+                (day_bounds(cutoff_day)[0],),
+            )
+    return dropped
+
+
+def default_partition_rows() -> int:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("SELECT count(*) FROM {}").format(sql.Identifier(DEFAULT_PARTITION)))
+            return int(cur.fetchone()[0])
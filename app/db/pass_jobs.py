@@ -0,0 +1,209 @@
+"""
+pass_jobs work queue: (satellite, time chunk) jobs shared by any number of
+generation workers. Claiming uses FOR UPDATE SKIP LOCKED, so concurrent
+workers never block on (or double-claim) the same row.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from psycopg.rows import dict_row
+
+from app.db.conn import get_conn
+from app.db.pass_writer import PASS_OWNER_SQL, copy_passes
+
+
+def plan_jobs(sat_tles: list[tuple[int, int]], start: datetime, end: datetime, chunk_hours: int) -> tuple[int, int]:
+    """
+    Insert one pending job per (satellite, chunk) of [start, end].
+    sat_tles are (satellite_id, tle_id) pairs: every chunk of a satellite is
+    pinned to that TLE, so a TLE fetched while jobs are still queued does not
+    mix element sets within one window.
+
+    Callers align start/end to the chunk grid (see plan_pass_jobs), so a
+    re-plan produces the same (satellite, chunk) keys. An already planned
+    chunk is left alone if it has the same TLE; with a newer TLE it is reset
+    to pending and re-pinned (unless a worker is running it), and its job
+    then replaces the chunk's passes. Returns (created, repinned).
+    """
+    jobs = []
+    for sat_id, tle_id in sat_tles:
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + timedelta(hours=chunk_hours), end)
+            jobs.append((sat_id, tle_id, start, end, chunk_start, chunk_end))
+            chunk_start = chunk_end
+
+    if not jobs:
+        return 0
+
+    sat_ids, tle_ids, w_start, w_end, c_start, c_end = (list(col) for col in zip(*jobs))
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO pass_jobs (satellite_id, tle_id, window_start, window_end, chunk_start, chunk_end)
+                SELECT * FROM unnest(
+                    %s::bigint[], %s::bigint[], %s::timestamptz[], %s::timestamptz[],
+                    %s::timestamptz[], %s::timestamptz[]
+                )
+                ON CONFLICT (satellite_id, chunk_start, chunk_end) DO UPDATE
+                SET tle_id = EXCLUDED.tle_id,
+                    window_start = EXCLUDED.window_start,
+                    window_end = EXCLUDED.window_end,
+                    status = 'pending',
+                    attempts = 0,
+                    worker = NULL,
+                    claimed_at = NULL,
+                    heartbeat_at = NULL,
+                    finished_at = NULL,
+                    passes = NULL,
+                    last_error = NULL
+                WHERE pass_jobs.tle_id <> EXCLUDED.tle_id
+                  AND pass_jobs.status <> 'running'
+                RETURNING (xmax = 0) AS created
+                """,
+                (sat_ids, tle_ids, w_start, w_end, c_start, c_end),
+            )
+            flags = [r[0] for r in cur.fetchall()]
+            return flags.count(True), flags.count(False)
+
+
+def claim_job(worker: str) -> dict | None:
+    """
+    Atomically take the oldest pending job, or None if the queue is empty
+    (or every pending row is locked by another worker right now).
+    """
+    with get_conn() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                UPDATE pass_jobs j
+                SET status = 'running',
+                    attempts = j.attempts + 1,
+                    worker = %s,
+                    claimed_at = now(),
+                    heartbeat_at = now(),
+                    last_error = NULL
+                WHERE j.id = (
+                    SELECT id
+                    FROM pass_jobs
+                    WHERE status = 'pending'
+                    ORDER BY id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING j.id, j.satellite_id, j.tle_id, j.window_start, j.window_end,
+                          j.chunk_start, j.chunk_end, j.attempts
+                """,
+                (worker,),
+            )
+            return cur.fetchone()
+
+
+def heartbeat(job_id: int, worker: str) -> bool:
+    """Refresh heartbeat_at. False means the job was taken away from this worker."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE pass_jobs
+                SET heartbeat_at = now()
+                WHERE id = %s AND worker = %s AND status = 'running'
+                """,
+                (job_id, worker),
+            )
+            return cur.rowcount == 1
+
+
+def complete_job(job: dict, worker: str, rows: list[tuple]) -> bool:
+    """
+    Replace the chunk's passes and mark the job done, in one transaction.
+
+    Passes belong to the chunk they rise in, so deleting by rise time makes a
+    retried job idempotent. The segments of a split pass (pass_writer) go with
+    the chunk the pass rose in, even when they start in a later chunk. Returns False (and writes nothing) if the job is
+    no longer owned by this worker, e.g. it was requeued after a missed heartbeat.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT 1 FROM pass_jobs
+                WHERE id = %s AND worker = %s AND status = 'running'
+                FOR UPDATE
+                """,
+                (job["id"], worker),
+            )
+            if cur.fetchone() is None:
+                return False
+
+            # start_ts >= rise time, so the start_ts bound is implied (and prunes partitions)
+            cur.execute(
+                f"""
+                DELETE FROM passes
+                WHERE satellite_id = %(sat)s
+                  AND start_ts >= %(lo)s
+                  AND {PASS_OWNER_SQL} >= %(lo)s
+                  AND {PASS_OWNER_SQL} < %(hi)s
+                """,
+                {"sat": job["satellite_id"], "lo": job["chunk_start"], "hi": job["chunk_end"]},
+            )
+            if rows:
+                copy_passes(cur, rows)
+            cur.execute(
+                """
+                UPDATE pass_jobs
+                SET status = 'done', finished_at = now(), passes = %s
+                WHERE id = %s
+                """,
+                (len(rows), job["id"]),
+            )
+            return True
+
+
+def fail_job(job: dict, worker: str, error: str, max_attempts: int) -> None:
+    """Put the job back in the queue, or park it as failed after max_attempts."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE pass_jobs
+                SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                    worker = NULL,
+                    last_error = %s
+                WHERE id = %s AND worker = %s AND status = 'running'
+                """,
+                (max_attempts, error[:2000], job["id"], worker),
+            )
+
+
+def requeue_stale_jobs(stale_after_s: int, max_attempts: int) -> tuple[int, int]:
+    """
+    Running jobs whose heartbeat is older than stale_after_s belong to a dead
+    worker: requeue them, or mark them failed once attempts are used up.
+    Returns (requeued, failed).
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE pass_jobs
+                SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                    worker = NULL,
+                    last_error = 'abandoned: heartbeat timeout'
+                WHERE status = 'running'
+                  AND heartbeat_at < now() - make_interval(secs => %s)
+                RETURNING status
+                """,
+                (max_attempts, stale_after_s),
+            )
+            statuses = [r[0] for r in cur.fetchall()]
+            return statuses.count("pending"), statuses.count("failed")
+
+
+def job_progress() -> list[dict]:
+    with get_conn() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute("SELECT * FROM pass_jobs_progress ORDER BY window_start;")
+            return cur.fetchall()
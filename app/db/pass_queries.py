@@ -0,0 +1,26 @@
+"""
+Window-overlap filter shared by the API and capture_passes_explain, so the
+plans captured offline are the plans the endpoints run.
+
+pass_window is the stored tstzrange(start_ts, end_ts, '[)') column: it matches
+GIST(ground_station_id, pass_window) and is INCLUDEd in the covering btrees
+(gs, start_ts) / (gs, end_ts), so overlap queries can be index-only.
+The start_ts bounds let Postgres prune passes partitions (daily on start_ts).
+The lower bound is exact, not a heuristic: pass_writer splits anything longer
+than PASS_MAX_DURATION_S, so every overlapping pass starts within that lookback.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.core.config import PASS_MAX_DURATION_S
+
+
+# ✅ For timestamptz columns, use tstzrange (NOT tsrange)
+OVERLAP_SQL = "start_ts < %s AND start_ts >= %s AND pass_window && tstzrange(%s, %s, '[)')"
+PASS_LOOKBACK = timedelta(seconds=PASS_MAX_DURATION_S)
+
+
+def overlap_params(qstart: datetime, qend: datetime) -> tuple:
+    """Parameters for OVERLAP_SQL, in order."""
+    return (qend, qstart - PASS_LOOKBACK, qstart, qend)
@@ -0,0 +1,128 @@
+"""
+Bulk pass writer: rows are streamed with COPY ... FROM STDIN (binary) into a
+session-local staging table and merged into passes with one
+INSERT ... SELECT ... ON CONFLICT DO NOTHING, instead of one round trip per row.
+
+No stored pass is longer than PASS_MAX_DURATION_S: the API's window queries
+only look that far back on start_ts (partition pruning), so a longer
+visibility window (HEO apogee, GEO) is written as back-to-back segments.
+Every segment carries the pass's rise time in pass_start (NULL on unsplit
+rows), so deletes that replace "passes rising in [a, b)" take all of a
+pass's segments and none of another's.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Iterable, Iterator
+
+from app.core.config import PASS_MAX_DURATION_S
+from app.db.conn import get_conn
+
+
+# input rows; stored rows add pass_start (see split_long_passes)
+PASS_COLUMNS = ("satellite_id", "ground_station_id", "start_ts", "end_ts", "duration_s", "max_elev_deg")
+STORED_COLUMNS = PASS_COLUMNS + ("pass_start",)
+_COPY_TYPES = ["int8", "int8", "timestamptz", "timestamptz", "int4", "float8", "timestamptz"]
+
+_COLS = ", ".join(STORED_COLUMNS)
+
+# rise time of the pass a row belongs to (segments share it)
+PASS_OWNER_SQL = "COALESCE(pass_start, start_ts)"
+
+# a satellite's passes overlapping [%(start)s, %(end)s), whole: a split pass goes
+# with all of its segments, including those outside the window
+DELETE_OVERLAPPING_SQL = """
+DELETE FROM passes
+WHERE satellite_id = %(sat)s
+  AND (
+      (start_ts < %(end)s AND end_ts > %(start)s)
+      OR pass_start IN (
+          SELECT pass_start FROM passes
+          WHERE satellite_id = %(sat)s
+            AND pass_start IS NOT NULL
+            AND start_ts < %(end)s
+            AND end_ts > %(start)s
+      )
+  )
+"""
+
+# temp: private to the session and never WAL-logged; emptied after every merge
+_CREATE_STAGE_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS pass_stage (
+    satellite_id      bigint NOT NULL,
+    ground_station_id bigint NOT NULL,
+    start_ts          timestamptz NOT NULL,
+    end_ts            timestamptz NOT NULL,
+    duration_s        integer NOT NULL,
+    max_elev_deg      double precision NOT NULL,
+    pass_start        timestamptz
+) ON COMMIT DELETE ROWS
+"""
+
+_MERGE_SQL = f"""
+WITH ins AS (
+    INSERT INTO passes ({_COLS})
+    SELECT {_COLS}
+    FROM pass_stage
+    ORDER BY satellite_id, ground_station_id, start_ts
+    ON CONFLICT (satellite_id, ground_station_id, start_ts, end_ts) DO NOTHING
+    RETURNING 1
+)
+SELECT count(*) FROM ins
+"""
+
+
+def split_long_passes(rows: Iterable[tuple], max_duration_s: int = PASS_MAX_DURATION_S) -> Iterator[tuple]:
+    """
+    PASS_COLUMNS rows -> STORED_COLUMNS rows. A pass up to max_duration_s
+    gets pass_start NULL; a longer one becomes consecutive segments of at
+    most that length, each with pass_start = the pass's start_ts and the
+    whole pass's max_elev_deg.
+    """
+    cap = timedelta(seconds=max_duration_s)
+    for row in rows:
+        sat_id, gs_id, start_ts, end_ts, duration_s, max_elev = row
+        if end_ts - start_ts <= cap:
+            yield (*row, None)
+            continue
+        seg_start = start_ts
+        while seg_start < end_ts:
+            seg_end = min(seg_start + cap, end_ts)
+            yield (
+                sat_id, gs_id, seg_start, seg_end, int(round((seg_end - seg_start).total_seconds())), max_elev, start_ts
+            )
+            seg_start = seg_end
+
+
+def copy_passes(cur, rows: Iterable[tuple]) -> tuple[int, int]:
+    """
+    COPY pass tuples (PASS_COLUMNS order) through the staging table and merge
+    them into passes, inside the cursor's current transaction. Passes longer
+    than PASS_MAX_DURATION_S are split first (split_long_passes).
+    Returns (inserted, skipped) counted in stored rows; skipped rows already
+    existed (or were repeated within rows).
+    """
+    cur.execute(_CREATE_STAGE_SQL)
+
+    staged = 0
+    with cur.copy(f"COPY pass_stage ({_COLS}) FROM STDIN (FORMAT BINARY)") as copy:
+        copy.set_types(_COPY_TYPES)
+        for row in split_long_passes(rows):
+            copy.write_row(row)
+            staged += 1
+
+    if not staged:
+        return 0, 0
+
+    cur.execute(_MERGE_SQL)
+    inserted = int(cur.fetchone()[0])
+    # several merges can share one transaction (batched flushes)
+    cur.execute("TRUNCATE pass_stage")
+    return inserted, staged - inserted
+
+
+def write_passes(rows: Iterable[tuple]) -> tuple[int, int]:
+    """copy_passes in its own connection/transaction. Returns (inserted, skipped)."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            return copy_passes(cur, rows)
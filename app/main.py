@@ -3,7 +3,10 @@ from dotenv import load_dotenv
 # ✅ Load .env BEFORE importing anything that reads env vars
 load_dotenv()
 
+import asyncio
 import logging
+import sys
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
 
@@ -12,25 +15,52 @@ from psycopg import OperationalError, IntegrityError, DataError, ProgrammingErro
 from psycopg.rows import dict_row
 
 from fastapi import FastAPI, Request, Query, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, HTMLResponse
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from app.db.conn import check_db, get_conn
+from psycopg_pool import PoolTimeout
+
+from app.db.conn import async_pool_stats, check_db_async, close_async_pool, get_aconn, open_async_pool
+from app.db.pass_queries import OVERLAP_SQL, overlap_params
 from app.schedule.optimizer import PassItem, best_non_overlapping_weighted, top_k_passes
 
 
-app = FastAPI(title="Digantara Ground Pass Prediction", version="0.1.0")
+logger = logging.getLogger("uvicorn.error")
+
+# psycopg's async mode can't run on Windows' default Proactor loop
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # the policy above is too late if the server built its loop before importing this module
+    if sys.platform == "win32" and isinstance(asyncio.get_running_loop(), asyncio.ProactorEventLoop):
+        raise RuntimeError(
+            "psycopg async needs the selector event loop on Windows; "
+            "run uvicorn with --reload or --workers N"
+        )
+    # warm the connection pool so the first requests don't pay connection setup
+    try:
+        await open_async_pool(wait=True)
+    except PoolTimeout:
+        # keep serving; DB endpoints return 503 until the pool can connect
+        logger.warning("DB pool warm-up timed out; continuing without ready connections")
+    yield
+    await close_async_pool()
+
+
+app = FastAPI(title="Digantara Ground Pass Prediction", version="0.1.0", lifespan=lifespan)
 
 # Rate limiting (in-memory for now)
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-logger = logging.getLogger("uvicorn.error")
-
 
 def map_db_error(exc: Exception):
     # Don’t expose raw SQL or internal details to users
@@ -77,31 +107,43 @@ def root(request: Request):
 
 @app.get("/db/health")
 @limiter.limit("30/minute")
-def db_health(request: Request):
+async def db_health(request: Request):
     # If DB is down, psycopg error handler will return clean 503 JSON
-    check_db()
+    await check_db_async()
     return {"db": "ok"}
 
 
+@app.get("/db/pool")
+@limiter.limit("30/minute")
+async def db_pool(request: Request):
+    # connection pool gauges/counters (psycopg_pool get_stats), e.g. requests_waiting, usage_ms
+    return await async_pool_stats()
+
+
+async def _fetch_rows(sql: str, params: tuple) -> list[dict]:
+    # one pooled async connection per query; the event loop is free while Postgres works
+    async with get_aconn() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(sql, params)
+            return await cur.fetchall()
+
+
 # ✅ List all ground stations
 @app.get("/ground-stations")
 @limiter.limit("60/minute")
-def get_ground_stations(
+async def get_ground_stations(
     request: Request,
     limit: int = Query(200, ge=1, le=500),
 ):
-    with get_conn() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
-                """
-                SELECT id, code, name, lat, lon, alt_m
-                FROM ground_stations
-                ORDER BY code
-                LIMIT %s
-                """,
-                (limit,),
-            )
-            rows = cur.fetchall()
+    rows = await _fetch_rows(
+        """
+        SELECT id, code, name, lat, lon, alt_m
+        FROM ground_stations
+        ORDER BY code
+        LIMIT %s
+        """,
+        (limit,),
+    )
 
     return {"count": len(rows), "items": rows}
 
@@ -129,14 +171,9 @@ def _validate_window(qstart: datetime, qend: datetime) -> None:
         )
 
 
-# ✅ For timestamptz columns, use tstzrange (NOT tsrange)
-# This matches your GiST index: GIST(ground_station_id, tstzrange(start_ts, end_ts, '[)'))
-_OVERLAP_SQL = "tstzrange(start_ts, end_ts, '[)') && tstzrange(%s, %s, '[)')"
-
-
 @app.get("/passes")
 @limiter.limit("60/minute")
-def get_passes(
+async def get_passes(
     request: Request,
     gs_id: int = Query(..., ge=1),
     start: datetime = Query(...),
@@ -148,21 +185,18 @@ def get_passes(
     qend = _to_utc(end)
     _validate_window(qstart, qend)
 
-    with get_conn() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            # ✅ Range overlap (uses GiST range index at scale)
-            cur.execute(
-                f"""
-                SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                FROM passes
-                WHERE ground_station_id = %s
-                  AND {_OVERLAP_SQL}
-                ORDER BY start_ts
-                LIMIT %s
-                """,
-                (gs_id, qstart, qend, limit),
-            )
-            rows = cur.fetchall()
+    # ✅ Range overlap (uses GiST range index at scale)
+    rows = await _fetch_rows(
+        f"""
+        SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+        FROM passes
+        WHERE ground_station_id = %s
+          AND {OVERLAP_SQL}
+        ORDER BY start_ts
+        LIMIT %s
+        """,
+        (gs_id, *overlap_params(qstart, qend), limit),
+    )
 
     return {"count": len(rows), "items": rows}
 
@@ -190,9 +224,74 @@ def _clip_row_to_window(row: dict, qstart: datetime, qend: datetime) -> PassItem
     )
 
 
+def _merge_segments(rows: list[dict]) -> list[dict]:
+    """
+    Rejoin the segments of passes longer than PASS_MAX_DURATION_S (stored
+    back to back by pass_writer) so the optimizers see one pass. Two distinct
+    passes of a satellite over a station can never touch: it has to set first.
+    """
+    merged: list[dict] = []
+    last: dict[tuple[int, int], dict] = {}
+    for r in sorted(rows, key=lambda r: r["start_ts"]):
+        key = (r["satellite_id"], r["ground_station_id"])
+        prev = last.get(key)
+        if prev is not None and prev["end_ts"] == r["start_ts"]:
+            prev["end_ts"] = r["end_ts"]
+            prev["max_elev_deg"] = max(prev["max_elev_deg"], r["max_elev_deg"])
+            continue
+        last[key] = dict(r)
+        merged.append(last[key])
+    return merged
+
+
+def _clip_rows(rows: list[dict], qstart: datetime, qend: datetime) -> list[PassItem]:
+    items: list[PassItem] = []
+    for r in _merge_segments(rows):
+        p = _clip_row_to_window(r, qstart, qend)
+        if p:
+            items.append(p)
+    return items
+
+
+def _best_for_rows(rows: list[dict], qstart: datetime, qend: datetime, metric: str):
+    # CPU-bound (clip + weighted interval DP); endpoints run it in the threadpool
+    return best_non_overlapping_weighted(_clip_rows(rows, qstart, qend), metric=metric)  # type: ignore[arg-type]
+
+
+def _top_for_rows(rows: list[dict], qstart: datetime, qend: datetime, metric: str, k: int) -> list[PassItem]:
+    return top_k_passes(_clip_rows(rows, qstart, qend), metric=metric, k=k)  # type: ignore[arg-type]
+
+
+async def _fetch_station_passes(
+    gs_id: int, satellite_id: int | None, qstart: datetime, qend: datetime
+) -> list[dict]:
+    if satellite_id is None:
+        return await _fetch_rows(
+            f"""
+            SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+            FROM passes
+            WHERE ground_station_id = %s
+              AND {OVERLAP_SQL}
+            ORDER BY end_ts ASC
+            """,
+            (gs_id, *overlap_params(qstart, qend)),
+        )
+    return await _fetch_rows(
+        f"""
+        SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+        FROM passes
+        WHERE ground_station_id = %s
+          AND satellite_id = %s
+          AND {OVERLAP_SQL}
+        ORDER BY end_ts ASC
+        """,
+        (gs_id, satellite_id, *overlap_params(qstart, qend)),
+    )
+
+
 @app.get("/schedule/best")
 @limiter.limit("30/minute")
-def schedule_best(
+async def schedule_best(
     request: Request,
     gs_id: int = Query(..., ge=1),
     start: datetime = Query(...),
@@ -204,40 +303,9 @@ def schedule_best(
     qend = _to_utc(end)
     _validate_window(qstart, qend)
 
-    with get_conn() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            if satellite_id is None:
-                cur.execute(
-                    f"""
-                    SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                    FROM passes
-                    WHERE ground_station_id = %s
-                      AND {_OVERLAP_SQL}
-                    ORDER BY end_ts ASC
-                    """,
-                    (gs_id, qstart, qend),
-                )
-            else:
-                cur.execute(
-                    f"""
-                    SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                    FROM passes
-                    WHERE ground_station_id = %s
-                      AND satellite_id = %s
-                      AND {_OVERLAP_SQL}
-                    ORDER BY end_ts ASC
-                    """,
-                    (gs_id, satellite_id, qstart, qend),
-                )
-            rows = cur.fetchall()
+    rows = await _fetch_station_passes(gs_id, satellite_id, qstart, qend)
 
-    items: list[PassItem] = []
-    for r in rows:
-        p = _clip_row_to_window(r, qstart, qend)
-        if p:
-            items.append(p)
-
-    chosen, score = best_non_overlapping_weighted(items, metric=metric)  # type: ignore[arg-type]
+    chosen, score = await run_in_threadpool(_best_for_rows, rows, qstart, qend, metric)
 
     return {
         "gs_id": gs_id,
@@ -264,7 +332,7 @@ def schedule_best(
 
 @app.get("/schedule/top")
 @limiter.limit("30/minute")
-def schedule_top(
+async def schedule_top(
     request: Request,
     gs_id: int = Query(..., ge=1),
     start: datetime = Query(...),
@@ -277,40 +345,9 @@ def schedule_top(
     qend = _to_utc(end)
     _validate_window(qstart, qend)
 
-    with get_conn() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            if satellite_id is None:
-                cur.execute(
-                    f"""
-                    SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                    FROM passes
-                    WHERE ground_station_id = %s
-                      AND {_OVERLAP_SQL}
-                    ORDER BY end_ts ASC
-                    """,
-                    (gs_id, qstart, qend),
-                )
-            else:
-                cur.execute(
-                    f"""
-                    SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                    FROM passes
-                    WHERE ground_station_id = %s
-                      AND satellite_id = %s
-                      AND {_OVERLAP_SQL}
-                    ORDER BY end_ts ASC
-                    """,
-                    (gs_id, satellite_id, qstart, qend),
-                )
-            rows = cur.fetchall()
+    rows = await _fetch_station_passes(gs_id, satellite_id, qstart, qend)
 
-    items: list[PassItem] = []
-    for r in rows:
-        p = _clip_row_to_window(r, qstart, qend)
-        if p:
-            items.append(p)
-
-    topk = top_k_passes(items, metric=metric, k=k)  # type: ignore[arg-type]
+    topk = await run_in_threadpool(_top_for_rows, rows, qstart, qend, metric, k)
 
     return {
         "gs_id": gs_id,
@@ -341,7 +378,7 @@ def schedule_top(
 
 @app.get("/network/schedule/best")
 @limiter.limit("15/minute")
-def network_schedule_best(
+async def network_schedule_best(
     request: Request,
     start: datetime = Query(...),
     end: datetime = Query(...),
@@ -358,32 +395,40 @@ def network_schedule_best(
     qend = _to_utc(end)
     _validate_window(qstart, qend)
 
-    with get_conn() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            if satellite_id is None:
-                cur.execute(
-                    f"""
-                    SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                    FROM passes
-                    WHERE {_OVERLAP_SQL}
-                    ORDER BY ground_station_id ASC, end_ts ASC
-                    """,
-                    (qstart, qend),
-                )
-            else:
-                cur.execute(
-                    f"""
-                    SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
-                    FROM passes
-                    WHERE satellite_id = %s
-                      AND {_OVERLAP_SQL}
-                    ORDER BY ground_station_id ASC, end_ts ASC
-                    """,
-                    (satellite_id, qstart, qend),
-                )
-
-            rows = cur.fetchall()
+    if satellite_id is None:
+        rows = await _fetch_rows(
+            f"""
+            SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+            FROM passes
+            WHERE {OVERLAP_SQL}
+            ORDER BY ground_station_id ASC, end_ts ASC
+            """,
+            overlap_params(qstart, qend),
+        )
+    else:
+        rows = await _fetch_rows(
+            f"""
+            SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg
+            FROM passes
+            WHERE satellite_id = %s
+              AND {OVERLAP_SQL}
+            ORDER BY ground_station_id ASC, end_ts ASC
+            """,
+            (satellite_id, *overlap_params(qstart, qend)),
+        )
+
+    result = await run_in_threadpool(_network_schedule, rows, qstart, qend, metric)
+    return {
+        "start": qstart.isoformat(),
+        "end": qend.isoformat(),
+        "metric": metric,
+        "satellite_id": satellite_id,
+        **result,
+    }
+
 
+def _network_schedule(rows: list[dict], qstart: datetime, qend: datetime, metric: str) -> dict:
+    """Per-station DP over the network rows (CPU-bound; runs in the threadpool)."""
     # Group rows by ground station and optimize each station
     by_station: dict[int, list[dict]] = defaultdict(list)
     for r in rows:
@@ -397,12 +442,7 @@ def network_schedule_best(
     unique_satellites: set[int] = set()
 
     for gs_id, gs_rows in by_station.items():
-        items: list[PassItem] = []
-        for r in gs_rows:
-            p = _clip_row_to_window(r, qstart, qend)
-            if p:
-                items.append(p)
-
+        items = _clip_rows(gs_rows, qstart, qend)
         if not items:
             continue
 
@@ -439,10 +479,6 @@ def network_schedule_best(
     schedule_by_station.sort(key=lambda x: x["score"], reverse=True)
 
     return {
-        "start": qstart.isoformat(),
-        "end": qend.isoformat(),
-        "metric": metric,
-        "satellite_id": satellite_id,
         "stations_used": len(schedule_by_station),
         "total_passes_scheduled": len(all_chosen_passes),
         "total_tracking_time_s": total_tracking_time_s,
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+from sgp4.api import Satrec
+
+from app.orbit.timebase import SECONDS_PER_DAY, JulianEpoch
+
+
+# Fit defaults: 12th-degree polynomials, segment = 1/4 of the orbital period
+# (capped), halved until every check point is within the error bound.
+DEFAULT_DEGREE = 12
+DEFAULT_TOL_KM = 1e-3
+_SEGMENTS_PER_REV = 4
+_MAX_SEGMENT_S = 3600.0
+_MIN_SEGMENT_S = 10.0
+
+
+class EphemerisError(RuntimeError):
+    pass
+
+
+def _cheb_nodes(degree: int) -> np.ndarray:
+    """Chebyshev points of the first kind on [-1, 1], increasing."""
+    k = np.arange(degree + 1)
+    return np.cos(np.pi * (k + 0.5) / (degree + 1))[::-1].copy()
+
+
+def _clenshaw(coef: np.ndarray, tau: np.ndarray) -> np.ndarray:
+    """
+    Evaluate Chebyshev series per row.
+    coef: (T, D+1, 3), tau: (T,) in [-1, 1] -> (T, 3)
+    """
+    t2 = (2.0 * tau)[:, None]
+    b1 = np.zeros((tau.size, 3))
+    b2 = np.zeros((tau.size, 3))
+    for j in range(coef.shape[1] - 1, 0, -1):
+        b1, b2 = t2 * b1 - b2 + coef[:, j, :], b1
+    return tau[:, None] * b1 - b2 + coef[:, 0, :]
+
+
+def _eval_segments(coef: np.ndarray, k: np.ndarray, tau: np.ndarray) -> np.ndarray:
+    """
+    Evaluate segment k[i] at tau[i] -> (T, 3).
+    Points are grouped by segment and each group is one (n, D+1) @ (D+1, 3)
+    matmul, which avoids gathering a (T, D+1, 3) coefficient copy.
+    """
+    out = np.empty((tau.size, 3))
+    if not tau.size:
+        return out
+
+    vander = np.polynomial.chebyshev.chebvander(tau, coef.shape[1] - 1)
+    order = None if np.all(k[1:] >= k[:-1]) else np.argsort(k, kind="stable")
+    ks = k if order is None else k[order]
+
+    cuts = np.flatnonzero(ks[1:] != ks[:-1]) + 1
+    lo = np.concatenate(([0], cuts))
+    hi = np.concatenate((cuts, [ks.size]))
+    for a, b in zip(lo.tolist(), hi.tolist()):
+        idx = slice(a, b) if order is None else order[a:b]
+        out[idx] = vander[idx] @ coef[ks[a]]
+    return out
+
+
+def _clenshaw_scalar(rows, tau: float) -> Tuple[float, float, float]:
+    """Scalar Clenshaw on one segment; rows = (cx, cy, cz) from highest degree down."""
+    t2 = 2.0 * tau
+    bx = by = bz = 0.0
+    px = py = pz = 0.0
+    for cx, cy, cz in rows[:-1]:
+        bx, px = t2 * bx - px + cx, bx
+        by, py = t2 * by - py + cy, by
+        bz, pz = t2 * bz - pz + cz, bz
+    cx, cy, cz = rows[-1]
+    return (tau * bx - px + cx, tau * by - py + cy, tau * bz - pz + cz)
+
+
+class ChebyshevEphemeris:
+    """
+    Piecewise Chebyshev fit of SGP4 TEME positions over [start, end].
+
+    The window is cut into equal segments; each gets a degree-D polynomial
+    per axis fitted at Chebyshev nodes, and the fit is checked against SGP4
+    between the nodes (segments are halved until the error bound holds).
+
+    Quacks like a Satrec for what pass prediction uses: sgp4_array(jd, fr)
+    returns (err, r_km, v_km_s) from the polynomials (v is the derivative of
+    the fitted position, which differs from SGP4's own velocity output by
+    ~1e-5 km/s); sgp4(jd, fr) is forwarded to the wrapped Satrec, and so are
+    element attributes (no_kozai, ecco, ...). So a fit can be passed wherever
+    a Satrec is expected and reused across stations and cutoffs.
+
+    Array lookups are much cheaper than sgp4_array. A single scalar lookup
+    through the polynomials (position_km) is several times slower than the
+    C SGP4 extension, which is why sgp4() - scalar scans, adaptive sampling
+    and rise/set refinement - stays on SGP4 (see scripts/ephemeris_benchmark).
+    """
+
+    def __init__(
+        self,
+        satrec: Satrec,
+        epoch: JulianEpoch,
+        span_s: float,
+        segment_s: float,
+        coef: np.ndarray,
+        max_error_km: float,
+    ):
+        self.satrec = satrec
+        self.epoch = epoch
+        self.span_s = float(span_s)
+        self.segment_s = float(segment_s)
+        self.coef = coef                        # (S, D+1, 3), km
+        self.max_error_km = float(max_error_km)
+
+        # velocity = d/dx of the position series (chain rule: dtau/dx = 2 / segment)
+        dcoef = np.polynomial.chebyshev.chebder(coef, axis=1) * (2.0 / self.segment_s)
+        self.dcoef = np.concatenate([dcoef, np.zeros_like(coef[:, :1, :])], axis=1)
+
+        # per-segment Python floats for position_km (numpy scalars are slow)
+        self._rows = [[tuple(map(float, c)) for c in seg[::-1]] for seg in coef]
+
+    # ---- construction ----
+
+    @classmethod
+    def fit(
+        cls,
+        satrec: Satrec,
+        start: datetime,
+        end: datetime,
+        degree: int = DEFAULT_DEGREE,
+        tol_km: float = DEFAULT_TOL_KM,
+        segment_s: float | None = None,
+    ) -> "ChebyshevEphemeris":
+        """
+        Fit [start, end]. segment_s defaults to 1/4 of the orbital period.
+        Raises EphemerisError if SGP4 fails inside the window or the bound
+        cannot be met with segments of at least _MIN_SEGMENT_S.
+        """
+        epoch = JulianEpoch.from_datetime(start)
+        span_s = epoch.seconds_to(end)
+        if span_s <= 0:
+            raise ValueError("start must be < end")
+        if degree < 1:
+            raise ValueError("degree must be >= 1")
+
+        if segment_s is None:
+            period_s = 2.0 * math.pi / (satrec.no_kozai / 60.0)
+            segment_s = min(_MAX_SEGMENT_S, period_s / _SEGMENTS_PER_REV)
+
+        nodes = _cheb_nodes(degree)
+        # fit matrix: coefficients = pinv(V) @ samples (same for every segment)
+        fit_mat = np.linalg.pinv(np.polynomial.chebyshev.chebvander(nodes, degree))
+        # check points: segment ends and midpoints between nodes
+        check = np.concatenate(([-1.0], (nodes[1:] + nodes[:-1]) / 2.0, [1.0]))
+
+        seg = float(segment_s)
+        while True:
+            n_seg = max(1, math.ceil(span_s / seg))
+            seg = span_s / n_seg
+            coef = cls._fit_segments(satrec, epoch, seg, n_seg, nodes, fit_mat)
+            err = cls._check_segments(satrec, epoch, seg, n_seg, coef, check)
+            if err <= tol_km:
+                return cls(satrec, epoch, span_s, seg, coef, err)
+            if seg / 2.0 < _MIN_SEGMENT_S:
+                raise EphemerisError(
+                    f"cannot reach {tol_km} km with degree {degree} (error {err:.3g} km at {seg:.0f} s segments)"
+                )
+            seg /= 2.0
+
+    @staticmethod
+    def _propagate(satrec: Satrec, epoch: JulianEpoch, x: np.ndarray) -> np.ndarray:
+        jd = np.full(x.size, epoch.jd)
+        fr = epoch.fr + x / SECONDS_PER_DAY
+        err, r, _v = satrec.sgp4_array(jd, fr)
+        bad = np.flatnonzero(err)
+        if bad.size:
+            i = int(bad[0])
+            raise EphemerisError(f"SGP4 error code={int(err[i])} at {epoch.to_datetime(float(x[i])).isoformat()}")
+        return r
+
+    @classmethod
+    def _fit_segments(cls, satrec, epoch, seg, n_seg, nodes, fit_mat) -> np.ndarray:
+        x = (np.arange(n_seg)[:, None] + (nodes[None, :] + 1.0) / 2.0) * seg   # (S, D+1)
+        r = cls._propagate(satrec, epoch, x.ravel()).reshape(n_seg, nodes.size, 3)
+        return np.einsum("kn,snc->skc", fit_mat, r)
+
+    @classmethod
+    def _check_segments(cls, satrec, epoch, seg, n_seg, coef, check) -> float:
+        x = (np.arange(n_seg)[:, None] + (check[None, :] + 1.0) / 2.0) * seg   # (S, C)
+        r = cls._propagate(satrec, epoch, x.ravel())
+        tau = np.broadcast_to(check, x.shape).ravel()
+        fitted = _clenshaw(np.repeat(coef, check.size, axis=0), tau)
+        return float(np.abs(fitted - r).max())
+
+    # ---- lookups ----
+
+    @property
+    def start(self) -> datetime:
+        return self.epoch.dt
+
+    @property
+    def end(self) -> datetime:
+        return self.epoch.to_datetime(self.span_s)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.epoch.seconds_to(start) >= 0.0 and self.epoch.seconds_to(end) <= self.span_s
+
+    def _locate(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # small slack for float noise at the window ends
+        if x.size and (x.min() < -1e-6 or x.max() > self.span_s + 1e-6):
+            raise ValueError("time outside the ephemeris window")
+        k = np.clip((x // self.segment_s).astype(np.intp), 0, self.coef.shape[0] - 1)
+        tau = 2.0 * (x - k * self.segment_s) / self.segment_s - 1.0
+        return k, tau
+
+    def positions_km(self, x_seconds: np.ndarray) -> np.ndarray:
+        """TEME positions (T, 3) in km at seconds from the fit start."""
+        x = np.asarray(x_seconds, dtype=float).ravel()
+        k, tau = self._locate(x)
+        return _eval_segments(self.coef, k, tau)
+
+    def _locate_scalar(self, x: float) -> Tuple[int, float]:
+        if x < -1e-6 or x > self.span_s + 1e-6:
+            raise ValueError("time outside the ephemeris window")
+        k = min(max(int(x // self.segment_s), 0), len(self._rows) - 1)
+        return k, 2.0 * (x - k * self.segment_s) / self.segment_s - 1.0
+
+    def position_km(self, x_seconds: float) -> Tuple[float, float, float]:
+        """Scalar TEME position in km, seconds from the fit start."""
+        k, tau = self._locate_scalar(float(x_seconds))
+        return _clenshaw_scalar(self._rows[k], tau)
+
+    def position_at(self, dt: datetime) -> Tuple[float, float, float]:
+        return self.position_km(self.epoch.seconds_to(dt))
+
+    # ---- Satrec-compatible interface ----
+
+    def _x_from_jd(self, jd, fr):
+        return ((np.asarray(jd, dtype=float) - self.epoch.jd) + (np.asarray(fr, dtype=float) - self.epoch.fr)) * SECONDS_PER_DAY
+
+    def sgp4(self, jd: float, fr: float):
+        # one-off lookups are cheaper (and exact) in the C extension than a Python Clenshaw
+        x = ((jd - self.epoch.jd) + (fr - self.epoch.fr)) * SECONDS_PER_DAY
+        if x < -1e-6 or x > self.span_s + 1e-6:
+            raise ValueError("time outside the ephemeris window")
+        return self.satrec.sgp4(jd, fr)
+
+    def sgp4_array(self, jd: np.ndarray, fr: np.ndarray):
+        x = self._x_from_jd(jd, fr).ravel()
+        k, tau = self._locate(x)
+        r = _eval_segments(self.coef, k, tau)
+        v = _eval_segments(self.dcoef, k, tau)
+        return np.zeros(x.size, dtype=np.uint8), r, v
+
+    def __getattr__(self, name: str):
+        # orbital elements (no_kozai, ecco, inclo, a, radiusearthkm, ...) come from the TLE
+        if name == "satrec":
+            raise AttributeError(name)
+        return getattr(self.satrec, name)
@@ -0,0 +1,263 @@
+"""
+Persistent ephemeris store: fixed-cadence SGP4 states written once,
+read back with numpy.memmap (zero-copy).
+
+Layout under the store directory:
+  index.json            satellite_id -> {tle_id, file, offset, count, start, step_s, line1, line2}
+  ephem_<stamp>.f64     raw float64 rows [rx, ry, rz, vx, vy, vz] (TEME, km and km/s),
+                        one contiguous block per satellite at `offset` bytes
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+from sgp4.api import Satrec
+
+from app.orbit.satrec_cache import get_satrec
+from app.orbit.timebase import SECONDS_PER_DAY, JulianEpoch
+
+
+DEFAULT_STORE_DIR = os.getenv("EPHEMERIS_DIR", "ephemeris_store")
+_INDEX_FILE = "index.json"
+_ROW = 6
+_ITEMSIZE = np.dtype(np.float64).itemsize
+
+# a requested instant counts as a stored sample if it is this close to one
+_GRID_TOL_S = 1e-6
+
+
+class EphemerisStoreError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, eq=False)
+class StoredEphemeris:
+    """
+    One satellite's stored states: sample k is at epoch + k * step_s.
+
+    Answers sgp4(jd, fr) / sgp4_array(jd, fr) like the Satrec it was built
+    from: instants on the stored grid are read from the memmap, anything else
+    (e.g. rise/set refinement) falls back to SGP4, so results are identical
+    to direct propagation. Element attributes come from the Satrec.
+    """
+    satellite_id: int
+    tle_id: int
+    epoch: JulianEpoch
+    step_s: float
+    states: np.ndarray      # (count, 6) memmap view
+    satrec: Satrec
+
+    @property
+    def count(self) -> int:
+        return int(self.states.shape[0])
+
+    @property
+    def start(self) -> datetime:
+        return self.epoch.dt
+
+    @property
+    def end(self) -> datetime:
+        return self.epoch.to_datetime((self.count - 1) * self.step_s)
+
+    @property
+    def teme_km(self) -> np.ndarray:
+        return self.states[:, :3]
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+    def align(self, dt: datetime) -> datetime:
+        """Last stored sample instant at or before dt (grids aligned to it read straight from the store)."""
+        x = self.epoch.seconds_to(dt)
+        k = max(0, int(np.floor(x / self.step_s + 1e-9)))
+        return self.epoch.to_datetime(k * self.step_s)
+
+    def sample_index(self, dt: datetime) -> int | None:
+        """Index of the stored sample at dt, or None if dt is not on the grid."""
+        k = self._grid_index(np.array([self.epoch.seconds_to(dt)]))[0]
+        return None if k < 0 else int(k)
+
+    def _grid_index(self, x: np.ndarray) -> np.ndarray:
+        # -1 where x is off-grid or out of range
+        kf = x / self.step_s
+        k = np.rint(kf).astype(np.intp)
+        ok = (np.abs(kf - k) * self.step_s <= _GRID_TOL_S) & (k >= 0) & (k < self.count)
+        return np.where(ok, k, -1)
+
+    def _x_from_jd(self, jd, fr) -> np.ndarray:
+        return ((np.asarray(jd, dtype=float) - self.epoch.jd) + (np.asarray(fr, dtype=float) - self.epoch.fr)) * SECONDS_PER_DAY
+
+    def sgp4(self, jd: float, fr: float):
+        # scalar path stays in plain floats: refinement calls this a lot, mostly off-grid
+        kf = ((jd - self.epoch.jd) + (fr - self.epoch.fr)) * SECONDS_PER_DAY / self.step_s
+        k = round(kf)
+        if abs(kf - k) * self.step_s > _GRID_TOL_S or not 0 <= k < self.count:
+            return self.satrec.sgp4(jd, fr)
+        row = self.states[k].tolist()
+        return 0, tuple(row[:3]), tuple(row[3:])
+
+    def sgp4_array(self, jd: np.ndarray, fr: np.ndarray):
+        jd = np.asarray(jd, dtype=float)
+        fr = np.asarray(fr, dtype=float)
+        k = self._grid_index(self._x_from_jd(jd, fr))
+        hit = k >= 0
+
+        if hit.all():
+            # contiguous run: a plain slice of the memmap, no gather
+            if k.size and k[-1] - k[0] == k.size - 1:
+                rows = np.asarray(self.states[k[0] : k[-1] + 1])
+            else:
+                rows = self.states[k]
+            return np.zeros(k.size, dtype=np.uint8), rows[:, :3], rows[:, 3:]
+
+        err = np.zeros(k.size, dtype=np.uint8)
+        r = np.empty((k.size, 3))
+        v = np.empty((k.size, 3))
+        rows = self.states[k[hit]]
+        r[hit], v[hit] = rows[:, :3], rows[:, 3:]
+        miss = ~hit
+        err[miss], r[miss], v[miss] = self.satrec.sgp4_array(jd[miss], fr[miss])
+        return err, r, v
+
+    def __getattr__(self, name: str):
+        # orbital elements (no_kozai, ecco, ...) for the adaptive scan bounds
+        if name == "satrec":
+            raise AttributeError(name)
+        return getattr(self.satrec, name)
+
+
+class EphemerisStore:
+    """
+    Directory-backed store. Readers memmap the data files (read-only, shared
+    page cache across processes); writers append one data file per build and
+    swap index.json atomically.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self._index: Dict[str, dict] | None = None
+        self._maps: Dict[str, np.memmap] = {}
+
+    # ---- index ----
+
+    @property
+    def index(self) -> Dict[str, dict]:
+        if self._index is None:
+            path = os.path.join(self.root, _INDEX_FILE)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {}
+        return self._index
+
+    def _write_index(self, index: Dict[str, dict]) -> None:
+        path = os.path.join(self.root, _INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+        self._index = index
+
+    # ---- read ----
+
+    def _memmap(self, file: str) -> np.memmap:
+        mm = self._maps.get(file)
+        if mm is None:
+            path = os.path.join(self.root, file)
+            if not os.path.exists(path):
+                raise EphemerisStoreError(f"index points to missing data file {path}")
+            mm = np.memmap(path, dtype=np.float64, mode="r")
+            self._maps[file] = mm
+        return mm
+
+    def get(self, satellite_id: int, tle_id: int | None = None) -> StoredEphemeris | None:
+        """
+        Stored states for a satellite, or None if missing or (when tle_id is
+        given) built from a different TLE.
+        """
+        entry = self.index.get(str(satellite_id))
+        if entry is None or (tle_id is not None and entry["tle_id"] != tle_id):
+            return None
+
+        first = entry["offset"] // _ITEMSIZE
+        flat = self._memmap(entry["file"])[first : first + entry["count"] * _ROW]
+        return StoredEphemeris(
+            satellite_id=int(satellite_id),
+            tle_id=int(entry["tle_id"]),
+            epoch=JulianEpoch.from_datetime(datetime.fromisoformat(entry["start"])),
+            step_s=float(entry["step_s"]),
+            states=flat.reshape(entry["count"], _ROW),
+            satrec=get_satrec(entry["line1"], entry["line2"]),
+        )
+
+    # ---- write ----
+
+    def build(
+        self,
+        sats: Iterable[dict],
+        start: datetime,
+        end: datetime,
+        step_s: int,
+    ) -> Tuple[str, int]:
+        """
+        Propagate every satellite ({satellite_id, tle_id, line1, line2}) on
+        start + k * step_s up to end and write them into one new data file.
+        Index entries for these satellites are replaced; data files no longer
+        referenced are removed. Returns (data file name, satellites written).
+        """
+        os.makedirs(self.root, exist_ok=True)
+        start = start.astimezone(timezone.utc)
+        ep = JulianEpoch.from_datetime(start)
+        count = int((end - start) // timedelta(seconds=step_s)) + 1
+        x = np.arange(count, dtype=float) * step_s
+        jd = np.full(count, ep.jd)
+        fr = ep.fr + x / SECONDS_PER_DAY
+
+        name = f"ephem_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')}.f64"
+        index = dict(self.index)
+        written = 0
+
+        with open(os.path.join(self.root, name), "wb") as f:
+            for sat in sats:
+                satrec = get_satrec(sat["line1"], sat["line2"])
+                err, r, v = satrec.sgp4_array(jd, fr)
+                bad = np.flatnonzero(err)
+                if bad.size:
+                    # decayed / invalid inside the window: leave it to live propagation
+                    index.pop(str(sat["satellite_id"]), None)
+                    continue
+
+                offset = f.tell()
+                f.write(np.ascontiguousarray(np.hstack((r, v)), dtype=np.float64).tobytes())
+                index[str(sat["satellite_id"])] = {
+                    "tle_id": int(sat["tle_id"]),
+                    "file": name,
+                    "offset": offset,
+                    "count": count,
+                    "start": start.isoformat(),
+                    "step_s": step_s,
+                    "line1": sat["line1"],
+                    "line2": sat["line2"],
+                }
+                written += 1
+
+        self._write_index(index)
+        self._drop_unreferenced()
+        return name, written
+
+    def _drop_unreferenced(self) -> None:
+        used = {e["file"] for e in self.index.values()}
+        for fn in os.listdir(self.root):
+            if fn.startswith("ephem_") and fn.endswith(".f64") and fn not in used:
+                self._maps.pop(fn, None)
+                try:
+                    os.remove(os.path.join(self.root, fn))
+                except OSError:
+                    # still mapped by a reader (Windows); next build retries
+                    pass
@@ -1,12 +1,43 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List, Tuple
+from typing import Iterator, List, Literal, Sequence, Tuple
 
-from sgp4.api import Satrec, jday
+import numpy as np
+from sgp4.api import Satrec
 
-from app.orbit.visibility import GroundStation, elevation_deg
+from app.orbit.ephemeris import ChebyshevEphemeris
+from app.orbit.satrec_cache import get_satrec
+from app.orbit.station_index import StationIndex, horizon_half_angle_rad
+from app.orbit.timebase import JulianEpoch
+from app.orbit.visibility import (
+    PreparedStation,
+    StationLike,
+    as_prepared_station,
+    elevation_deg_jd,
+    elevation_deg_matrix,
+    elevation_deg_matrix_ecef,
+    elevation_from_ecef_deg,
+    teme_to_ecef_array,
+    teme_to_ecef_jd,
+)
+
+
+# "scalar": one SGP4 call + elevation per step (reference implementation)
+# "vector": whole time grid propagated with Satrec.sgp4_array, elevation as arrays
+# "adaptive": variable step, long jumps while the satellite cannot be visible
+ScanMode = Literal["scalar", "vector", "adaptive"]
+
+_EARTH_RATE_RAD_S = 7.2921159e-5
+# adaptive scan safety margins (keep jumps conservative)
+_RATE_SAFETY = 1.1
+_RATE_FLOOR_RAD_S = 2e-6
+_RADIUS_SAFETY = 1.01
+
+# predict_passes_multi only uses the station prefilter below this visibility-cone coverage
+_PREFILTER_MAX_CONE_FRACTION = 0.15
 
 
 @dataclass(frozen=True)
@@ -15,6 +46,14 @@ class PassWindow:
     end_ts: datetime
     duration_s: int
     max_elev_deg: float
+    refine_evals: int = 0   # elevation evaluations spent refining rise + set
+
+
+# Rise/set refinement stops once the crossing estimate moves by less than this
+DEFAULT_REFINE_TOL_S = 1e-3
+
+# iter_passes(mode="vector") propagates this many grid samples per block
+DEFAULT_STREAM_BLOCK_SAMPLES = 1440
 
 
 class PassPredictionError(RuntimeError):
@@ -27,126 +66,692 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-def _r_km_at(sat: Satrec, t: datetime) -> Tuple[float, float, float]:
-    t = _to_utc(t)
-    jd, fr = jday(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond / 1e6)
+def _r_km_at(sat: Satrec, ep: JulianEpoch, x: float) -> Tuple[float, float, float]:
+    jd, fr = ep.at(x)
     err, r, _v = sat.sgp4(jd, fr)
     if err != 0:
-        raise PassPredictionError(f"SGP4 error code={err} at {t.isoformat()}")
+        raise PassPredictionError(f"SGP4 error code={err} at {ep.to_datetime(x).isoformat()}")
     return (r[0], r[1], r[2])
 
 
-def _elev_at(sat: Satrec, gs: GroundStation, t: datetime) -> float:
-    r_km = _r_km_at(sat, t)
-    return elevation_deg(r_km, t, gs)
+def _elev_at(sat: Satrec, gs: PreparedStation, ep: JulianEpoch, x: float) -> float:
+    jd, fr = ep.at(x)
+    return elevation_deg_jd(_r_km_at(sat, ep, x), jd, fr, gs)
 
 
-def _bisect_crossing(
+def _refine_crossing(
     sat: Satrec,
-    gs: GroundStation,
-    t0: datetime,
-    t1: datetime,
+    gs: PreparedStation,
+    ep: JulianEpoch,
+    x0: float,
+    x1: float,
     elev0: float,
     elev1: float,
     cutoff_deg: float,
-    iters: int = 25,
-) -> datetime:
+    tol_s: float = DEFAULT_REFINE_TOL_S,
+    max_evals: int = 50,
+) -> Tuple[float, int]:
     """
-    Find approximate time when elevation crosses cutoff between (t0,t1).
+    Find the time when elevation crosses cutoff between (x0,x1), seconds from ep.
     Assumes elev0 and elev1 are on opposite sides of cutoff.
+
+    Illinois (modified regula falsi) on f(x) = elev(x) - cutoff,
+    seeded with the coarse samples, so no extra evaluations are spent on
+    the bracket ends. Stops once the estimate moves by <= tol_s seconds.
+    Returns (crossing time in seconds from ep, number of elevation evaluations).
     """
-    lo = _to_utc(t0)
-    hi = _to_utc(t1)
-    elo = elev0
-    ehi = elev1
+    a, b = x0, x1
+    fa = elev0 - cutoff_deg
+    fb = elev1 - cutoff_deg
 
-    for _ in range(iters):
-        mid = lo + (hi - lo) / 2
-        emid = _elev_at(sat, gs, mid)
+    x = b
+    side = 0
+    evals = 0
+    while evals < max_evals:
+        x_prev = x
+        x = (a * fb - b * fa) / (fb - fa)
+        if evals and abs(x - x_prev) <= tol_s:
+            break
 
-        # Keep interval that still brackets the cutoff crossing
-        if (elo - cutoff_deg) * (emid - cutoff_deg) <= 0:
-            hi, ehi = mid, emid
+        fx = _elev_at(sat, gs, ep, x) - cutoff_deg
+        evals += 1
+
+        if fx == 0.0:
+            break
+        if (fx > 0.0) == (fb > 0.0):
+            b, fb = x, fx
+            if side == -1:
+                fa /= 2.0
+            side = -1
         else:
-            lo, elo = mid, emid
+            a, fa = x, fx
+            if side == +1:
+                fb /= 2.0
+            side = +1
+
+        if b - a <= tol_s:
+            x = (a + b) / 2.0
+            break
+
+    return x, evals
+
+
+def _max_angular_rate_rad_s(sat: Satrec) -> float:
+    """
+    Upper bound on how fast the satellite direction moves in ECEF.
+
+    In ECEF the direction rotates with (theta_dot * h_hat - w_earth * z_hat),
+    |.|^2 = theta_dot^2 + w^2 - 2*theta_dot*w*cos(i). theta_dot ranges from
+    apogee to perigee rate (n*sqrt(1-+e)/(1+-e)^1.5) and the expression is
+    convex in theta_dot, so the maximum is at one of those ends. A safety
+    factor and a small floor cover SGP4 perturbations (J2 drift etc.).
+    """
+    n = sat.no_kozai / 60.0  # rad/min -> rad/s
+    e = sat.ecco
+    cos_i = math.cos(sat.inclo)
+
+    def rel_rate(theta_dot: float) -> float:
+        w = _EARTH_RATE_RAD_S
+        return math.sqrt(max(0.0, theta_dot * theta_dot + w * w - 2.0 * theta_dot * w * cos_i))
+
+    rate_perigee = n * math.sqrt(1.0 + e) / (1.0 - e) ** 1.5
+    rate_apogee = n * math.sqrt(1.0 - e) / (1.0 + e) ** 1.5
+    return _RATE_SAFETY * max(rel_rate(rate_perigee), rel_rate(rate_apogee)) + _RATE_FLOOR_RAD_S
+
+
+def _max_visible_central_angle_rad(sat: Satrec, gs: PreparedStation, cutoff_deg: float) -> float:
+    """
+    Largest Earth-central angle between station and satellite at which the
+    satellite can be at or above cutoff: the visibility-cone half-angle
+    (station_index.horizon_half_angle_rad) with the satellite at its apogee
+    radius and a spherical Earth through the station.
+    """
+    r_earth = math.sqrt(sum(c * c for c in gs.ecef_m)) / 1000.0
+    r_apogee = _RADIUS_SAFETY * sat.a * sat.radiusearthkm * (1.0 + sat.ecco)
+    return float(horizon_half_angle_rad(r_apogee, cutoff_deg, r_earth))
+
+
+class _AdaptiveSampler:
+    """
+    Variable-step sampler for mode="adaptive" (one station).
+
+    Below cutoff, jump ahead by the time the satellite provably cannot become
+    visible: (central angle - max visible central angle) / max angular rate.
+    Close to the horizon this falls back to a fine step of
+    min(step_seconds, min_duration_s), so any pass lasting at least that long
+    contains a sample. Inside a pass the regular step_seconds is used.
+
+    The bound uses the perigee rate for the whole orbit, so the gain is large
+    for LEO and small (or negative) for eccentric / high orbits.
+    """
+
+    def __init__(
+        self, sat: Satrec, gs: PreparedStation, step_seconds: int, cutoff_deg: float, min_duration_s: int
+    ):
+        self.sat = sat
+        self.gs = gs
+        self.step_seconds = step_seconds
+        self.cutoff_deg = cutoff_deg
+        self.fine_s = max(1, min(step_seconds, min_duration_s))
+        self.rate = _max_angular_rate_rad_s(sat)
+        self.lam_max = _max_visible_central_angle_rad(sat, gs, cutoff_deg)
+
+        sx, sy, sz = gs.ecef_m
+        self._s = (sx, sy, sz)
+        self._s_norm = math.sqrt(sx * sx + sy * sy + sz * sz)
 
-    return lo + (hi - lo) / 2
+    def sample(self, ep: JulianEpoch, x: float) -> Tuple[float, float]:
+        """(elevation at x seconds from ep, seconds until the next sample)."""
+        jd, fr = ep.at(x)
+        p = teme_to_ecef_jd(_r_km_at(self.sat, ep, x), jd, fr)
+        el = elevation_from_ecef_deg(p, self.gs)
+
+        if el > self.cutoff_deg:
+            return el, float(self.step_seconds)
+
+        px, py, pz = p
+        sx, sy, sz = self._s
+        cos_lam = (px * sx + py * sy + pz * sz) / (math.sqrt(px * px + py * py + pz * pz) * self._s_norm)
+        lam = math.acos(max(-1.0, min(1.0, cos_lam)))
+        return el, max(float(self.fine_s), (lam - self.lam_max) / self.rate)
+
+
+def _position_source(
+    line1: str,
+    line2: str,
+    ephemeris: ChebyshevEphemeris | None,
+    start: datetime,
+    end: datetime,
+    mode: ScanMode = "vector",
+) -> Satrec | ChebyshevEphemeris:
+    # a ChebyshevEphemeris answers sgp4()/sgp4_array() like the Satrec it was fitted from;
+    # only vector scans use its array lookups, the scalar ones call SGP4 directly
+    if ephemeris is None:
+        return get_satrec(line1, line2)
+    if not ephemeris.covers(_to_utc(start), _to_utc(end)):
+        raise ValueError("ephemeris does not cover [start, end]")
+    return ephemeris if mode == "vector" else ephemeris.satrec
 
 
 def predict_passes(
     line1: str,
     line2: str,
-    gs: GroundStation,
+    gs: StationLike,
     start: datetime,
     end: datetime,
     step_seconds: int = 30,
     cutoff_deg: float = 0.0,
     min_duration_s: int = 5,
+    mode: ScanMode = "scalar",
+    refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+    ephemeris: ChebyshevEphemeris | None = None,
 ) -> List[PassWindow]:
     """
-    Coarse scan at step_seconds, then refine rise/set using bisection.
+    Predict passes for a TLE (parsed through the shared Satrec cache).
+    See predict_passes_satrec for the parameters.
+
+    ephemeris: a ChebyshevEphemeris fitted for this TLE over [start, end];
+    vector-mode grid positions then come from the polynomials instead of
+    sgp4_array, while scalar lookups (scalar/adaptive scans, rise/set
+    refinement) stay on SGP4. Fit once, reuse for every station / cutoff.
+    """
+    return predict_passes_satrec(
+        _position_source(line1, line2, ephemeris, start, end, mode),
+        gs,
+        start,
+        end,
+        step_seconds=step_seconds,
+        cutoff_deg=cutoff_deg,
+        min_duration_s=min_duration_s,
+        mode=mode,
+        refine_tol_s=refine_tol_s,
+    )
+
+
+def predict_passes_satrec(
+    sat: Satrec,
+    gs: StationLike,
+    start: datetime,
+    end: datetime,
+    step_seconds: int = 30,
+    cutoff_deg: float = 0.0,
+    min_duration_s: int = 5,
+    mode: ScanMode = "scalar",
+    refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+) -> List[PassWindow]:
+    """
+    Coarse scan at step_seconds, then refine rise/set to refine_tol_s seconds
+    (Illinois root finding, typically 4-6 evaluations per crossing).
+
+    mode="vector" propagates the whole coarse grid in one sgp4_array call
+    and computes elevations as arrays; only rise/set refinement is scalar.
+    mode="adaptive" skips below-horizon stretches the satellite provably
+    cannot rise in and never misses a pass of at least
+    min(step_seconds, min_duration_s) seconds (see _AdaptiveSampler).
+
+    Same as a single-station PassScanner advanced once from start to end.
     """
     start = _to_utc(start)
     end = _to_utc(end)
     if start >= end:
         raise ValueError("start must be < end")
 
-    sat = Satrec.twoline2rv(line1, line2)
+    scanner = PassScanner(
+        sat,
+        [gs],
+        start,
+        step_seconds=step_seconds,
+        cutoff_deg=cutoff_deg,
+        min_duration_s=min_duration_s,
+        refine_tol_s=refine_tol_s,
+        mode=mode,
+        end=end,
+    )
+    return scanner.advance(end)[0]
 
-    step = timedelta(seconds=step_seconds)
-    times: List[datetime] = []
-    t = start
-    while t <= end:
-        times.append(t)
-        t += step
 
-    passes: List[PassWindow] = []
-    in_pass = False
-    pass_start: datetime | None = None
-    max_elev = -1e9
+def iter_passes(
+    line1: str,
+    line2: str,
+    gs: StationLike,
+    start: datetime,
+    end: datetime,
+    step_seconds: int = 30,
+    cutoff_deg: float = 0.0,
+    min_duration_s: int = 5,
+    mode: ScanMode = "scalar",
+    refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+    block_samples: int = DEFAULT_STREAM_BLOCK_SAMPLES,
+) -> Iterator[PassWindow]:
+    """
+    Streaming predict_passes for a TLE (parsed through the shared Satrec
+    cache). See iter_passes_satrec for the parameters.
+    """
+    return iter_passes_satrec(
+        get_satrec(line1, line2),
+        gs,
+        start,
+        end,
+        step_seconds=step_seconds,
+        cutoff_deg=cutoff_deg,
+        min_duration_s=min_duration_s,
+        mode=mode,
+        refine_tol_s=refine_tol_s,
+        block_samples=block_samples,
+    )
 
-    prev_t = None
-    prev_el = None
 
-    for cur_t in times:
-        cur_el = _elev_at(sat, gs, cur_t)
+def iter_passes_satrec(
+    sat: Satrec,
+    gs: StationLike,
+    start: datetime,
+    end: datetime,
+    step_seconds: int = 30,
+    cutoff_deg: float = 0.0,
+    min_duration_s: int = 5,
+    mode: ScanMode = "scalar",
+    refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+    block_samples: int = DEFAULT_STREAM_BLOCK_SAMPLES,
+) -> Iterator[PassWindow]:
+    """
+    Generator version of predict_passes_satrec: same passes, same order.
+    A single-station PassScanner is advanced block_samples * step_seconds
+    at a time and each block's passes are yielded as soon as it is scanned,
+    so memory does not grow with the window length.
+    """
+    start = _to_utc(start)
+    end = _to_utc(end)
+    if start >= end:
+        raise ValueError("start must be < end")
+    if mode not in ("scalar", "vector", "adaptive"):
+        raise ValueError(f"Unknown scan mode: {mode}")
+    if block_samples <= 0:
+        raise ValueError("block_samples must be > 0")
+
+    return _iter_passes(
+        sat, as_prepared_station(gs), start, end, step_seconds, cutoff_deg,
+        min_duration_s, mode, refine_tol_s, block_samples,
+    )
+
 
-        if prev_t is not None and prev_el is not None:
-            # entering: prev <= cutoff and cur > cutoff
-            if (not in_pass) and (prev_el <= cutoff_deg) and (cur_el > cutoff_deg):
-                refined_start = _bisect_crossing(
-                    sat, gs, prev_t, cur_t, prev_el, cur_el, cutoff_deg
+def _iter_passes(
+    sat: Satrec,
+    gs: PreparedStation,
+    start: datetime,
+    end: datetime,
+    step_seconds: int,
+    cutoff_deg: float,
+    min_duration_s: int,
+    mode: ScanMode,
+    refine_tol_s: float,
+    block_samples: int,
+) -> Iterator[PassWindow]:
+    # generator body of iter_passes_satrec (kept separate so bad arguments raise at call time)
+    scanner = PassScanner(
+        sat,
+        [gs],
+        start,
+        step_seconds=step_seconds,
+        cutoff_deg=cutoff_deg,
+        min_duration_s=min_duration_s,
+        refine_tol_s=refine_tol_s,
+        mode=mode,
+        end=end,
+    )
+    block = timedelta(seconds=step_seconds * block_samples)
+    until = start
+    while until < end:
+        until = min(until + block, end)
+        yield from scanner.advance(until)[0]
+
+
+def predict_passes_multi(
+    line1: str,
+    line2: str,
+    stations: Sequence[StationLike],
+    start: datetime,
+    end: datetime,
+    step_seconds: int = 30,
+    cutoff_deg: float = 0.0,
+    min_duration_s: int = 5,
+    refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+    index: StationIndex | None = None,
+    ephemeris: ChebyshevEphemeris | None = None,
+) -> List[List[PassWindow]]:
+    """
+    Multi-station predict_passes for a TLE (parsed through the shared
+    Satrec cache). See predict_passes_multi_satrec for the parameters
+    and predict_passes for `ephemeris`.
+    """
+    return predict_passes_multi_satrec(
+        _position_source(line1, line2, ephemeris, start, end),
+        stations,
+        start,
+        end,
+        step_seconds=step_seconds,
+        cutoff_deg=cutoff_deg,
+        min_duration_s=min_duration_s,
+        refine_tol_s=refine_tol_s,
+        index=index,
+    )
+
+
+def predict_passes_multi_satrec(
+    sat: Satrec,
+    stations: Sequence[StationLike],
+    start: datetime,
+    end: datetime,
+    step_seconds: int = 30,
+    cutoff_deg: float = 0.0,
+    min_duration_s: int = 5,
+    refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+    index: StationIndex | None = None,
+) -> List[List[PassWindow]]:
+    """
+    Multi-station variant of predict_passes (vector scan).
+
+    The satellite is propagated once over the coarse grid and an N x T
+    elevation matrix is built for all stations; rise/set refinement then
+    runs per station as usual. Returns one pass list per station, in the
+    order of `stations`.
+
+    With a StationIndex built over the same stations (same order), elevation
+    is only computed for stations inside the satellite's visibility cone
+    (plus one sample either side, so crossings are bracketed by real values).
+
+    Same as a PassScanner advanced once from start to end.
+    """
+    start = _to_utc(start)
+    end = _to_utc(end)
+    if start >= end:
+        raise ValueError("start must be < end")
+    if not stations:
+        return []
+
+    scanner = PassScanner(
+        sat,
+        stations,
+        start,
+        step_seconds=step_seconds,
+        cutoff_deg=cutoff_deg,
+        min_duration_s=min_duration_s,
+        refine_tol_s=refine_tol_s,
+        index=index,
+    )
+    return scanner.advance(end)
+
+
+def _elevation_matrix(
+    r: np.ndarray,
+    jd: np.ndarray,
+    fr: np.ndarray,
+    prepared: Sequence[PreparedStation],
+    cutoff_deg: float,
+    index: StationIndex | None,
+) -> np.ndarray:
+    """(N, T) elevations for a propagated grid, pruned by the index when it pays off."""
+    if index is not None:
+        p = teme_to_ecef_array(r, jd, fr)
+        # for wide cones (high orbits) the dense matrix is cheaper than pruning
+        if index.cone_fraction(p, cutoff_deg) <= _PREFILTER_MAX_CONE_FRACTION:
+            mask = index.candidate_mask(p, cutoff_deg)
+            mask[:, 1:] |= mask[:, :-1].copy()
+            mask[:, :-1] |= mask[:, 1:].copy()
+            return elevation_deg_matrix_ecef(p, prepared, mask)
+
+    return elevation_deg_matrix(r, jd, fr, prepared)
+
+
+
+
+class PassScanner:
+    """
+    Resumable pass scan over any number of stations; the one rise/set state
+    machine behind predict_passes, iter_passes and predict_passes_multi.
+
+    advance(until) samples only what has not been seen yet, up to `until`,
+    and returns the passes whose set time falls in that stretch. The last
+    sample, the refined rise time and the running max elevation are kept per
+    station between calls, so a window can be fed chunk by chunk (or
+    streamed) with no overlap and every pass is emitted exactly once, with
+    the same result as a single call over the whole window.
+
+    mode (see ScanMode):
+      "vector"    grid start + k * step, propagated with one sgp4_array call
+                  per advance and an N x T elevation matrix (index prunes it)
+      "scalar"    same grid, one SGP4 call per sample (reference)
+      "adaptive"  per-station variable step (_AdaptiveSampler); `end` clamps
+                  the last sample to the window end, so chunking does not
+                  change which instants are sampled (without it each advance
+                  bound is sampled instead)
+
+    A pass already in progress at `start` is skipped and one still in
+    progress at the last advance() is never emitted; pass_starts() tells
+    which stations have such an open pass.
+    """
+
+    def __init__(
+        self,
+        sat: Satrec,
+        stations: Sequence[StationLike],
+        start: datetime,
+        step_seconds: int = 30,
+        cutoff_deg: float = 0.0,
+        min_duration_s: int = 5,
+        refine_tol_s: float = DEFAULT_REFINE_TOL_S,
+        index: StationIndex | None = None,
+        mode: ScanMode = "vector",
+        end: datetime | None = None,
+    ):
+        if step_seconds <= 0:
+            raise ValueError("step_seconds must be > 0")
+        if mode not in ("scalar", "vector", "adaptive"):
+            raise ValueError(f"Unknown scan mode: {mode}")
+        if index is not None and len(index) != len(stations):
+            raise ValueError("index must be built over the same stations")
+
+        self.sat = sat
+        self.stations: List[PreparedStation] = [as_prepared_station(gs) for gs in stations]
+        self.step_seconds = step_seconds
+        self.cutoff_deg = cutoff_deg
+        self.min_duration_s = min_duration_s
+        self.refine_tol_s = refine_tol_s
+        self.index = index
+        self.mode = mode
+
+        self._ep = JulianEpoch.from_datetime(_to_utc(start))
+        self._end_x = self._ep.seconds_to(_to_utc(end)) if end is not None else None
+        self._next_k = 0  # grid modes: next grid sample to evaluate
+
+        n = len(self.stations)
+        self._prev_x = np.full(n, np.nan)          # time of the last sample (s from start)
+        self._prev_el = np.full(n, np.nan)         # elevation at that sample
+        self._pass_start = np.full(n, np.nan)      # refined rise (s from start); NaN = not in a pass
+        self._start_evals = np.zeros(n, dtype=int)
+        self._max_elev = np.full(n, -np.inf)
+
+        # adaptive: per-station sampler and next sample time
+        self._samplers = (
+            [_AdaptiveSampler(sat, gs, step_seconds, cutoff_deg, min_duration_s) for gs in self.stations]
+            if mode == "adaptive"
+            else []
+        )
+        self._next_x = np.zeros(n)
+
+    @property
+    def start(self) -> datetime:
+        return self._ep.dt
+
+    @property
+    def scanned_until(self) -> datetime | None:
+        """Time of the last sample every station has consumed (None before the first advance)."""
+        if not self.stations or np.isnan(self._prev_x).any():
+            return None
+        return self._ep.to_datetime(float(self._prev_x.min()))
+
+    def in_pass(self) -> List[bool]:
+        """Per station: currently inside a pass that has not set yet."""
+        return [not math.isnan(x) for x in self._pass_start.tolist()]
+
+    def pass_starts(self) -> List[datetime | None]:
+        """Per station: refined rise time of the pass still in progress, or None."""
+        return [None if math.isnan(x) else self._ep.to_datetime(x) for x in self._pass_start.tolist()]
+
+    def advance(self, until: datetime) -> List[List[PassWindow]]:
+        """
+        Consume samples up to `until` (inclusive) and return the passes,
+        one list per station, that ended in the newly scanned stretch.
+        """
+        until = _to_utc(until)
+        out: List[List[PassWindow]] = [[] for _ in self.stations]
+        if not self.stations:
+            return out
+
+        if self.mode == "adaptive":
+            x_until = self._ep.seconds_to(until)
+            for n, gs in enumerate(self.stations):
+                xs, series = self._adaptive_samples(n, x_until)
+                out[n] = self._consume(n, gs, xs, series)
+            return out
+
+        last_k = (until - self._ep.dt) // timedelta(seconds=self.step_seconds)
+        if last_k < self._next_k:
+            return out
+
+        ks = np.arange(self._next_k, last_k + 1, dtype=float)
+        xs = ks * self.step_seconds
+        elev = self._grid_elevations(ks)
+
+        for n, gs in enumerate(self.stations):
+            out[n] = self._consume(n, gs, xs, elev[n])
+
+        self._next_k = last_k + 1
+        return out
+
+    def _grid_elevations(self, ks: np.ndarray) -> np.ndarray:
+        """(N, T) elevations at grid samples ks."""
+        step = self.step_seconds
+
+        if self.mode == "scalar":
+            rows: List[List[float]] = [[] for _ in self.stations]
+            for k in ks.tolist():
+                x = k * step
+                jd, fr = self._ep.at(x)
+                r = _r_km_at(self.sat, self._ep, x)
+                for row, gs in zip(rows, self.stations):
+                    row.append(elevation_deg_jd(r, jd, fr, gs))
+            return np.array(rows, dtype=float).reshape(len(self.stations), ks.size)
+
+        jd = np.full(ks.size, self._ep.jd)
+        fr = self._ep.fr + ks * (step / 86400.0)
+
+        err, r, _v = self.sat.sgp4_array(jd, fr)
+        bad = np.flatnonzero(err)
+        if bad.size:
+            i = int(bad[0])
+            t = self._ep.to_datetime(float(ks[i]) * step)
+            raise PassPredictionError(f"SGP4 error code={int(err[i])} at {t.isoformat()}")
+
+        return _elevation_matrix(r, jd, fr, self.stations, self.cutoff_deg, self.index)
+
+    def _adaptive_samples(self, n: int, x_until: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Station n's adaptive samples (times, elevations) in (last sample, x_until]."""
+        sampler = self._samplers[n]
+        last = float(self._prev_x[n])
+        nxt = float(self._next_x[n])
+        xs: List[float] = []
+        els: List[float] = []
+
+        while True:
+            # without a known window end, this advance's bound is sampled
+            x = nxt if self._end_x is not None else min(nxt, x_until)
+            if x > x_until or (not math.isnan(last) and x <= last):
+                break
+
+            el, dt = sampler.sample(self._ep, x)
+            xs.append(x)
+            els.append(el)
+            last = x
+
+            if self._end_x is not None and x >= self._end_x:
+                nxt = math.inf
+            elif self._end_x is not None:
+                nxt = min(x + dt, self._end_x)
+            else:
+                nxt = x + dt
+
+        self._next_x[n] = nxt
+        return np.asarray(xs, dtype=float), np.asarray(els, dtype=float)
+
+    def _consume(self, n: int, gs: PreparedStation, xs: np.ndarray, series: np.ndarray) -> List[PassWindow]:
+        """Scan new samples of station n, prefixed with its last sample from the previous advance()."""
+        if not xs.size:
+            return []
+        if not math.isnan(self._prev_x[n]):
+            xs = np.concatenate(([self._prev_x[n]], xs))
+            series = np.concatenate(([self._prev_el[n]], series))
+
+        passes = self._scan_series(n, gs, xs, series)
+        self._prev_x[n] = xs[-1]
+        self._prev_el[n] = series[-1]
+        return passes
+
+    def _scan_series(
+        self, n: int, gs: PreparedStation, xs: np.ndarray, series: np.ndarray
+    ) -> List[PassWindow]:
+        """
+        Rise/set edges of one station's samples (series[i] at xs[i] seconds
+        from start, any spacing), continuing the pass state carried over from
+        the previous advance(). A pass starts at a sample above cutoff after
+        one at or below it; only the crossings are refined.
+        """
+        cutoff = self.cutoff_deg
+        above = series > cutoff
+        # edge i = state change between sample i and i+1 (rises and sets alternate)
+        edges = np.flatnonzero(above[1:] != above[:-1])
+
+        passes: List[PassWindow] = []
+        # running max covers series[seg_from:]; a carried-over pass starts at 0
+        seg_from = 0
+
+        for i in edges.tolist():
+            x0 = float(xs[i])
+            x1 = float(xs[i + 1])
+
+            if above[i + 1]:
+                self._pass_start[n], self._start_evals[n] = _refine_crossing(
+                    self.sat, gs, self._ep, x0, x1, float(series[i]), float(series[i + 1]),
+                    cutoff, self.refine_tol_s,
                 )
-                in_pass = True
-                pass_start = refined_start
-                max_elev = cur_el
-
-            # while inside pass
-            if in_pass:
-                if cur_el > max_elev:
-                    max_elev = cur_el
-
-                # exiting: prev > cutoff and cur <= cutoff
-                if (prev_el > cutoff_deg) and (cur_el <= cutoff_deg):
-                    refined_end = _bisect_crossing(
-                        sat, gs, prev_t, cur_t, prev_el, cur_el, cutoff_deg
+                self._max_elev[n] = -np.inf
+                seg_from = i + 1
+                continue
+
+            if math.isnan(self._pass_start[n]):
+                # scan starts inside a pass: skipped
+                continue
+
+            refined_end, end_evals = _refine_crossing(
+                self.sat, gs, self._ep, x0, x1, float(series[i]), float(series[i + 1]),
+                cutoff, self.refine_tol_s,
+            )
+            pass_start = float(self._pass_start[n])
+            max_elev = max(float(self._max_elev[n]), float(series[seg_from : i + 2].max()))
+            dur = refined_end - pass_start
+            if dur >= self.min_duration_s:
+                passes.append(
+                    PassWindow(
+                        start_ts=self._ep.to_datetime(pass_start),
+                        end_ts=self._ep.to_datetime(refined_end),
+                        duration_s=int(round(dur)),
+                        max_elev_deg=max_elev,
+                        refine_evals=int(self._start_evals[n]) + end_evals,
                     )
-                    if pass_start is not None:
-                        dur = (refined_end - pass_start).total_seconds()
-                        if dur >= min_duration_s:
-                            passes.append(
-                                PassWindow(
-                                    start_ts=pass_start,
-                                    end_ts=refined_end,
-                                    duration_s=int(round(dur)),
-                                    max_elev_deg=float(max_elev),
-                                )
-                            )
-                    in_pass = False
-                    pass_start = None
-                    max_elev = -1e9
-
-        prev_t = cur_t
-        prev_el = cur_el
-
-    return passes
+                )
+            self._pass_start[n] = np.nan
+            self._max_elev[n] = -np.inf
+
+        if not math.isnan(self._pass_start[n]) and seg_from < series.size:
+            self._max_elev[n] = max(float(self._max_elev[n]), float(series[seg_from:].max()))
+
+        return passes
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict
+
+from sgp4.api import Satrec
+
+
+# Enough for the full CelesTrak "active" group with room to spare
+SATREC_CACHE_SIZE = 20000
+
+
+@lru_cache(maxsize=SATREC_CACHE_SIZE)
+def get_satrec(line1: str, line2: str) -> Satrec:
+    """
+    Parsed Satrec for a TLE, cached by (line1, line2) with LRU eviction.
+    Shared by pass prediction, propagation and the generation scripts
+    (per process). Treat the returned object as read-only.
+    """
+    return Satrec.twoline2rv(line1, line2)
+
+
+def satrec_cache_info() -> Dict[str, int]:
+    info = get_satrec.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize or 0,
+    }
+
+
+def clear_satrec_cache() -> None:
+    get_satrec.cache_clear()
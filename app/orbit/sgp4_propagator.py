@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Iterable, List, Tuple
+from datetime import datetime
+from typing import Iterable, List, Sequence, Tuple
 
-from sgp4.api import Satrec, jday
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+from app.orbit.satrec_cache import get_satrec
+from app.orbit.timebase import datetime_to_jd
 
 
 @dataclass(frozen=True)
@@ -14,15 +18,26 @@ class Sgp4State:
     v_km_s: Tuple[float, float, float] # velocity in km/s (TEME)
 
 
-class Sgp4PropagationError(RuntimeError):
-    pass
+@dataclass(frozen=True)
+class CatalogStates:
+    """
+    Propagation result for a whole catalog on a shared time vector.
+    Arrays are C-contiguous; row i is the i-th input TLE.
+    """
+    jd: np.ndarray       # (times,) Julian date, whole part
+    fr: np.ndarray       # (times,) Julian date, fraction
+    r_km: np.ndarray     # (sats, times, 3) position in km (TEME)
+    v_km_s: np.ndarray   # (sats, times, 3) velocity in km/s (TEME)
+    err: np.ndarray      # (sats, times) SGP4 error code, 0 = ok
 
+    @property
+    def sat_ok(self) -> np.ndarray:
+        """(sats,) bool: True where every time point propagated without error."""
+        return ~self.err.any(axis=1)
 
-def _to_jd(dt: datetime) -> tuple[float, float]:
-    if dt.tzinfo is None:
-        raise ValueError("datetime must be timezone-aware (UTC).")
-    dt = dt.astimezone(timezone.utc)
-    return jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+
+class Sgp4PropagationError(RuntimeError):
+    pass
 
 
 def propagate_tle(line1: str, line2: str, times: Iterable[datetime]) -> List[Sgp4State]:
@@ -30,11 +45,11 @@ def propagate_tle(line1: str, line2: str, times: Iterable[datetime]) -> List[Sgp
     Propagate a single TLE at given UTC datetimes.
     Returns TEME r,v.
     """
-    sat = Satrec.twoline2rv(line1, line2)
+    sat = get_satrec(line1, line2)
     out: List[Sgp4State] = []
 
     for t in times:
-        jd, fr = _to_jd(t)
+        jd, fr = datetime_to_jd(t)
         err, r, v = sat.sgp4(jd, fr)
         if err != 0:
             # We keep it simple: fail fast. Later we can log + skip bad points if needed.
@@ -42,3 +57,48 @@ def propagate_tle(line1: str, line2: str, times: Iterable[datetime]) -> List[Sgp
         out.append(Sgp4State(t=t, r_km=(r[0], r[1], r[2]), v_km_s=(v[0], v[1], v[2])))
 
     return out
+
+
+def _to_jd_arrays(times: Iterable[datetime]) -> tuple[np.ndarray, np.ndarray]:
+    pairs = [datetime_to_jd(t) for t in times]
+    if not pairs:
+        return np.empty(0), np.empty(0)
+    jd, fr = zip(*pairs)
+    return np.array(jd, dtype=float), np.array(fr, dtype=float)
+
+
+def propagate_satrecs(sats: Sequence[Satrec], jd: np.ndarray, fr: np.ndarray) -> CatalogStates:
+    """
+    Propagate already-parsed satellites at split Julian dates (jd, fr)
+    in one SatrecArray call. Errors are reported per point, never raised.
+    """
+    jd = np.ascontiguousarray(jd, dtype=float)
+    fr = np.ascontiguousarray(fr, dtype=float)
+    if not sats:
+        return CatalogStates(
+            jd=jd,
+            fr=fr,
+            r_km=np.empty((0, jd.size, 3)),
+            v_km_s=np.empty((0, jd.size, 3)),
+            err=np.empty((0, jd.size), dtype=np.uint8),
+        )
+
+    err, r, v = SatrecArray(list(sats)).sgp4(jd, fr)
+    return CatalogStates(jd=jd, fr=fr, r_km=r, v_km_s=v, err=err)
+
+
+def propagate_catalog(
+    tles: Sequence[Tuple[str, str]],
+    times: Iterable[datetime],
+) -> CatalogStates:
+    """
+    Propagate many TLEs (line1, line2) at the same UTC datetimes.
+
+    Unlike propagate_tle this does not fail fast: check `err` / `sat_ok`
+    to drop satellites that decayed or hit an SGP4 error.
+    Memory is sats * times * 48 bytes for r+v, so batch very long
+    time vectors (10k sats x 1440 points ~ 0.7 GB).
+    """
+    sats = [get_satrec(l1, l2) for l1, l2 in tles]
+    jd, fr = _to_jd_arrays(times)
+    return propagate_satrecs(sats, jd, fr)
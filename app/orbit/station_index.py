@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable, List, Mapping, Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.orbit.visibility import GroundStation, PreparedStation, StationLike, as_prepared_station
+
+
+# Lower the cutoff by this much when sizing the visibility cone: covers the
+# geodetic "up" vs geocentric direction difference (<0.2 deg) with room to spare.
+_CUTOFF_MARGIN_DEG = 1.0
+
+
+def horizon_half_angle_rad(r_km: np.ndarray, cutoff_deg: float, r_earth_km: float) -> np.ndarray:
+    """
+    Earth-central half-angle of the visibility cone of a satellite at
+    geocentric radius r_km: a station within this angle of the sub-point can
+    see it at >= cutoff_deg (spherical Earth of radius r_earth_km).
+    """
+    el = math.radians(cutoff_deg - _CUTOFF_MARGIN_DEG)
+    ratio = np.clip(r_earth_km * math.cos(el) / np.asarray(r_km, dtype=float), -1.0, 1.0)
+    return np.arccos(ratio) - el
+
+
+class StationIndex:
+    """
+    KD-tree over ground-station unit vectors (geocentric).
+
+    Given satellite sub-points (as ECEF positions) it returns the stations
+    inside the visibility cone, so elevation math only runs for those.
+    Query cost grows with the number of candidates, not with the number
+    of stations in the network.
+    """
+
+    def __init__(self, station_ids: Sequence[int], stations: Sequence[StationLike]):
+        if len(station_ids) != len(stations):
+            raise ValueError("station_ids and stations must have the same length")
+
+        self.station_ids: List[int] = [int(i) for i in station_ids]
+        self.stations: List[PreparedStation] = [as_prepared_station(gs) for gs in stations]
+
+        ecef = np.array([ps.ecef_m for ps in self.stations], dtype=float).reshape(-1, 3)
+        norms = np.linalg.norm(ecef, axis=1)
+        self._unit = ecef / norms[:, None] if len(self.stations) else ecef
+        # smallest station radius gives the widest (conservative) cone
+        self._r_earth_km = float(norms.min()) / 1000.0 if len(self.stations) else 0.0
+        self._tree = cKDTree(self._unit)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping]) -> "StationIndex":
+        """
+        Build from ground_stations rows ({id, lat, lon, alt_m}), e.g. the
+        dict rows loaded by the generation scripts.
+        """
+        rows = list(rows)
+        return cls(
+            [r["id"] for r in rows],
+            [
+                GroundStation(
+                    lat_deg=float(r["lat"]),
+                    lon_deg=float(r["lon"]),
+                    alt_m=float(r["alt_m"] or 0.0),
+                )
+                for r in rows
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def cone_fraction(self, p_ecef_m: np.ndarray, cutoff_deg: float = 0.0) -> float:
+        """
+        Mean fraction of the sphere covered by the visibility cone along the
+        track. High values (MEO/GEO/HEO) mean the prefilter cannot prune much.
+        """
+        p = np.asarray(p_ecef_m, dtype=float).reshape(-1, 3)
+        if not p.shape[0]:
+            return 0.0
+        half = horizon_half_angle_rad(np.linalg.norm(p, axis=1) / 1000.0, cutoff_deg, self._r_earth_km)
+        return float(np.mean((1.0 - np.cos(np.clip(half, 0.0, math.pi))) / 2.0))
+
+    def candidates(self, p_ecef_m: np.ndarray, cutoff_deg: float = 0.0) -> List[np.ndarray]:
+        """
+        For each satellite ECEF position (T, 3) in meters, the positions
+        (indexes into self.stations) of stations that may see it at >= cutoff.
+        """
+        p = np.asarray(p_ecef_m, dtype=float).reshape(-1, 3)
+        if not len(self.stations) or not p.shape[0]:
+            return [np.empty(0, dtype=np.intp) for _ in range(p.shape[0])]
+
+        r = np.linalg.norm(p, axis=1)
+        half = horizon_half_angle_rad(r / 1000.0, cutoff_deg, self._r_earth_km)
+        chord = 2.0 * np.sin(np.clip(half, 0.0, math.pi) / 2.0)
+
+        hits = self._tree.query_ball_point(p / r[:, None], chord)
+        return [np.asarray(h, dtype=np.intp) for h in hits]
+
+    def candidate_mask(self, p_ecef_m: np.ndarray, cutoff_deg: float = 0.0) -> np.ndarray:
+        """
+        (N, T) bool mask of (station, sample) pairs worth evaluating.
+        False means the station certainly sees the satellite below cutoff.
+        """
+        hits = self.candidates(p_ecef_m, cutoff_deg)
+        mask = np.zeros((len(self.stations), len(hits)), dtype=bool)
+        if hits:
+            counts = np.fromiter((h.size for h in hits), dtype=np.intp, count=len(hits))
+            mask[np.concatenate(hits), np.repeat(np.arange(len(hits)), counts)] = True
+        return mask
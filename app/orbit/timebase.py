@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+
+from sgp4.api import jday
+
+
+SECONDS_PER_DAY = 86400.0
+
+
+def datetime_to_jd(dt: datetime) -> Tuple[float, float]:
+    """
+    Timezone-aware datetime -> split Julian date (jd, fr) as used by sgp4.
+    """
+    if dt.tzinfo is None:
+        raise ValueError("datetime must be timezone-aware (UTC)")
+    dt = dt.astimezone(timezone.utc)
+    return jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+
+
+@dataclass(frozen=True)
+class JulianEpoch:
+    """
+    Time base for the orbit hot path.
+
+    Instants are float seconds from `dt`; (jd, fr) is the same instant as a
+    split Julian date, so any offset maps to SGP4 input with one add:
+    (jd, fr + seconds / 86400). Conversion back to datetime only happens at
+    the API boundary (PassWindow).
+    """
+    dt: datetime
+    jd: float
+    fr: float
+
+    @classmethod
+    def from_datetime(cls, dt: datetime) -> "JulianEpoch":
+        jd, fr = datetime_to_jd(dt)
+        return cls(dt=dt.astimezone(timezone.utc), jd=jd, fr=fr)
+
+    def at(self, seconds: float) -> Tuple[float, float]:
+        """Split Julian date `seconds` after the epoch."""
+        return self.jd, self.fr + seconds / SECONDS_PER_DAY
+
+    def to_datetime(self, seconds: float) -> datetime:
+        return self.dt + timedelta(seconds=seconds)
+
+    def seconds_to(self, dt: datetime) -> float:
+        """Offset of an aware datetime from the epoch, in seconds."""
+        return (dt - self.dt).total_seconds()
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Tuple
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, Sequence, Tuple, Union
 
-from sgp4.api import jday
+import numpy as np
+
+from app.orbit.timebase import datetime_to_jd
 
 
 # WGS84 constants
@@ -21,6 +24,24 @@ class GroundStation:
     alt_m: float = 0.0
 
 
+@dataclass(frozen=True, eq=False)
+class PreparedStation:
+    """
+    GroundStation with its geometry precomputed once:
+    - ecef_m: station position in ECEF (meters)
+    - enu_rows: ECEF -> ENU rotation as rows (east, north, up unit vectors)
+    - ecef_arr / enu_mat: same values as NumPy arrays for the array paths
+    """
+    gs: GroundStation
+    ecef_m: Tuple[float, float, float]
+    enu_rows: Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float, float]]
+    ecef_arr: np.ndarray    # (3,)
+    enu_mat: np.ndarray     # (3, 3)
+
+
+StationLike = Union[GroundStation, PreparedStation]
+
+
 def gmst_rad(jd_ut1: float) -> float:
     """
     Approx GMST in radians.
@@ -37,6 +58,66 @@ def gmst_rad(jd_ut1: float) -> float:
     return math.radians(gmst_deg)
 
 
+def gmst_rad_array(jd_ut1: np.ndarray) -> np.ndarray:
+    """Vectorized gmst_rad (same formula), radians."""
+    d = np.asarray(jd_ut1, dtype=float) - 2451545.0
+    T = d / 36525.0
+    gmst_deg = 280.46061837 + 360.98564736629 * d + 0.000387933 * (T * T) - (T * T * T) / 38710000.0
+    return np.radians(np.mod(gmst_deg, 360.0))
+
+
+# GMST rotation (cos, sin) per time grid. Every station and satellite scanned
+# on the same grid (same jd/fr arrays) reuses one entry. Keyed by size and end
+# points, confirmed with an exact array compare; FIFO-bounded.
+GMST_CACHE_SIZE = 64
+_GMST_CACHE: Dict[Tuple[int, float, float, float, float], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+_GMST_STATS = {"hits": 0, "misses": 0}
+
+
+def gmst_cos_sin(jd: np.ndarray, fr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    cos/sin of GMST for a grid of split Julian dates, cached per grid.
+    The returned arrays are shared between callers: do not modify them.
+    """
+    jd = np.asarray(jd, dtype=float).ravel()
+    fr = np.asarray(fr, dtype=float).ravel()
+    if not jd.size:
+        return np.empty(0), np.empty(0)
+
+    key = (jd.size, float(jd[0]), float(fr[0]), float(jd[-1]), float(fr[-1]))
+    hit = _GMST_CACHE.get(key)
+    if hit is not None and np.array_equal(hit[0], jd) and np.array_equal(hit[1], fr):
+        _GMST_STATS["hits"] += 1
+        return hit[2], hit[3]
+
+    _GMST_STATS["misses"] += 1
+    theta = gmst_rad_array(jd + fr)
+    c = np.cos(theta)
+    s = np.sin(theta)
+    for arr in (c, s):
+        arr.flags.writeable = False
+
+    if len(_GMST_CACHE) >= GMST_CACHE_SIZE:
+        _GMST_CACHE.pop(next(iter(_GMST_CACHE)))
+    _GMST_CACHE[key] = (jd.copy(), fr.copy(), c, s)
+    return c, s
+
+
+def gmst_cache_info() -> Dict[str, int]:
+    return {
+        "hits": _GMST_STATS["hits"],
+        "misses": _GMST_STATS["misses"],
+        "size": len(_GMST_CACHE),
+        "maxsize": GMST_CACHE_SIZE,
+    }
+
+
+def clear_gmst_cache() -> None:
+    _GMST_CACHE.clear()
+    _GMST_STATS["hits"] = 0
+    _GMST_STATS["misses"] = 0
+
+
 def geodetic_to_ecef(gs: GroundStation) -> Tuple[float, float, float]:
     """
     Convert lat/lon/alt to ECEF (meters).
@@ -59,11 +140,14 @@ def teme_to_ecef(r_km: Tuple[float, float, float], t: datetime) -> Tuple[float,
     Approx conversion: rotate TEME around Z by GMST.
     Output ECEF meters.
     """
-    if t.tzinfo is None:
-        raise ValueError("datetime must be timezone-aware (UTC)")
-    t = t.astimezone(timezone.utc)
+    jd, fr = datetime_to_jd(t)
+    return teme_to_ecef_jd(r_km, jd, fr)
+
 
-    jd, fr = jday(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond / 1e6)
+def teme_to_ecef_jd(r_km: Tuple[float, float, float], jd: float, fr: float) -> Tuple[float, float, float]:
+    """
+    teme_to_ecef at a split Julian date (jd, fr); no datetime handling.
+    """
     theta = gmst_rad(jd + fr)  # radians
 
     x_km, y_km, z_km = r_km
@@ -98,18 +182,211 @@ def ecef_to_enu(dx: float, dy: float, dz: float, gs: GroundStation) -> Tuple[flo
     return (e, n, u)
 
 
-def elevation_deg(r_teme_km: Tuple[float, float, float], t: datetime, gs: GroundStation) -> float:
+@lru_cache(maxsize=4096)
+def prepare_station(gs: GroundStation) -> PreparedStation:
     """
-    Elevation angle (degrees) of the satellite as seen from the ground station at time t.
-    > 0 means above the horizon.
+    Precompute station ECEF position and ENU rotation (memoized per GroundStation).
     """
-    sx, sy, sz = geodetic_to_ecef(gs)
-    px, py, pz = teme_to_ecef(r_teme_km, t)
+    lat = math.radians(gs.lat_deg)
+    lon = math.radians(gs.lon_deg)
+    sin_lat = math.sin(lat)
+    cos_lat = math.cos(lat)
+    sin_lon = math.sin(lon)
+    cos_lon = math.cos(lon)
+
+    # same basis as ecef_to_enu
+    rows = (
+        (-sin_lon, cos_lon, 0.0),
+        (-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat),
+        (cos_lat * cos_lon, cos_lat * sin_lon, sin_lat),
+    )
+    ecef = geodetic_to_ecef(gs)
+    return PreparedStation(
+        gs=gs,
+        ecef_m=ecef,
+        enu_rows=rows,
+        ecef_arr=np.array(ecef, dtype=float),
+        enu_mat=np.array(rows, dtype=float),
+    )
+
+
+# station_id -> PreparedStation, shared for the whole process (generation run)
+_PREPARED_BY_ID: Dict[int, PreparedStation] = {}
+
+
+def get_prepared_station(station_id: int, gs: GroundStation) -> PreparedStation:
+    """
+    Prepared station cached by DB station id.
+    Re-prepares if the coordinates for that id changed (e.g. re-seeded CSV).
+    """
+    ps = _PREPARED_BY_ID.get(station_id)
+    if ps is None or ps.gs != gs:
+        ps = prepare_station(gs)
+        _PREPARED_BY_ID[station_id] = ps
+    return ps
+
+
+def clear_prepared_stations() -> None:
+    _PREPARED_BY_ID.clear()
+    prepare_station.cache_clear()
+
+
+def as_prepared_station(gs: StationLike) -> PreparedStation:
+    """Pass PreparedStation through; prepare (memoized) a plain GroundStation."""
+    return gs if isinstance(gs, PreparedStation) else prepare_station(gs)
+
 
+def _enu_from_ecef(p_ecef_m: Tuple[float, float, float], ps: PreparedStation) -> Tuple[float, float, float]:
+    px, py, pz = p_ecef_m
+    sx, sy, sz = ps.ecef_m
     dx = px - sx
     dy = py - sy
     dz = pz - sz
 
-    e, n, u = ecef_to_enu(dx, dy, dz, gs)
-    horiz = math.sqrt(e * e + n * n)
-    return math.degrees(math.atan2(u, horiz))
+    (ex, ey, ez), (nx, ny, nz), (ux, uy, uz) = ps.enu_rows
+    return (
+        ex * dx + ey * dy + ez * dz,
+        nx * dx + ny * dy + nz * dz,
+        ux * dx + uy * dy + uz * dz,
+    )
+
+
+def elevation_from_ecef_deg(p_ecef_m: Tuple[float, float, float], gs: StationLike) -> float:
+    """
+    Elevation (degrees) of an ECEF position (meters); for callers that already
+    rotated the satellite to ECEF and need it for other geometry too.
+    """
+    e, n, u = _enu_from_ecef(p_ecef_m, as_prepared_station(gs))
+    return math.degrees(math.atan2(u, math.sqrt(e * e + n * n)))
+
+
+def elevation_deg(r_teme_km: Tuple[float, float, float], t: datetime, gs: StationLike) -> float:
+    """
+    Elevation angle (degrees) of the satellite as seen from the ground station at time t.
+    > 0 means above the horizon.
+    Accepts a GroundStation or a PreparedStation (preferred in loops).
+    """
+    return elevation_from_ecef_deg(teme_to_ecef(r_teme_km, t), gs)
+
+
+def elevation_deg_jd(r_teme_km: Tuple[float, float, float], jd: float, fr: float, gs: StationLike) -> float:
+    """
+    elevation_deg at a split Julian date (jd, fr).
+    """
+    return elevation_from_ecef_deg(teme_to_ecef_jd(r_teme_km, jd, fr), gs)
+
+
+def look_angles_deg(
+    r_teme_km: Tuple[float, float, float], t: datetime, gs: StationLike
+) -> Tuple[float, float]:
+    """
+    (azimuth, elevation) in degrees. Azimuth is clockwise from north in [0, 360).
+    """
+    e, n, u = _enu_from_ecef(teme_to_ecef(r_teme_km, t), as_prepared_station(gs))
+    az = math.degrees(math.atan2(e, n)) % 360.0
+    el = math.degrees(math.atan2(u, math.sqrt(e * e + n * n)))
+    return (az, el)
+
+
+def teme_to_ecef_array(r_teme_km: np.ndarray, jd: np.ndarray, fr: np.ndarray) -> np.ndarray:
+    """
+    Vectorized teme_to_ecef for a (T, 3) block sampled at split Julian dates
+    (or (S, T, 3) for several satellites on the same grid).
+    Output has the same shape, ECEF meters. GMST comes from the per-grid cache.
+    """
+    c, s = gmst_cos_sin(jd, fr)
+
+    r = np.asarray(r_teme_km, dtype=float)
+    out = np.empty(r.shape)
+    np.multiply(c, r[..., 0], out=out[..., 0])
+    out[..., 0] += s * r[..., 1]
+    np.multiply(c, r[..., 1], out=out[..., 1])
+    out[..., 1] -= s * r[..., 0]
+    out[..., 2] = r[..., 2]
+    out *= 1000.0
+    return out
+
+
+def _enu_array(r_teme_km: np.ndarray, jd: np.ndarray, fr: np.ndarray, ps: PreparedStation) -> np.ndarray:
+    """(T, 3) ENU vectors (meters) from the station to the satellite."""
+    d = teme_to_ecef_array(r_teme_km, jd, fr) - ps.ecef_arr
+    return d @ ps.enu_mat.T
+
+
+def elevation_deg_array(
+    r_teme_km: np.ndarray,
+    jd: np.ndarray,
+    fr: np.ndarray,
+    gs: StationLike,
+) -> np.ndarray:
+    """
+    Vectorized elevation_deg for a (T, 3) block of TEME positions (km)
+    sampled at split Julian dates (jd, fr). Returns a (T,) array in degrees.
+    """
+    enu = _enu_array(r_teme_km, jd, fr, as_prepared_station(gs))
+    return np.degrees(np.arctan2(enu[:, 2], np.hypot(enu[:, 0], enu[:, 1])))
+
+
+def look_angles_deg_array(
+    r_teme_km: np.ndarray,
+    jd: np.ndarray,
+    fr: np.ndarray,
+    gs: StationLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized look_angles_deg: returns (azimuth, elevation) arrays in degrees.
+    """
+    enu = _enu_array(r_teme_km, jd, fr, as_prepared_station(gs))
+    az = np.mod(np.degrees(np.arctan2(enu[:, 0], enu[:, 1])), 360.0)
+    el = np.degrees(np.arctan2(enu[:, 2], np.hypot(enu[:, 0], enu[:, 1])))
+    return az, el
+
+
+def elevation_deg_matrix(
+    r_teme_km: np.ndarray,
+    jd: np.ndarray,
+    fr: np.ndarray,
+    stations: Sequence[StationLike],
+) -> np.ndarray:
+    """
+    Elevation (degrees) of one satellite track as seen from N ground stations.
+    r_teme_km is (T, 3); returns an (N, T) matrix.
+
+    The satellite is rotated to ECEF once; per station only two dot products
+    are needed (up component and squared range), so memory stays O(N*T).
+    """
+    return elevation_deg_matrix_ecef(teme_to_ecef_array(r_teme_km, jd, fr), stations)
+
+
+def elevation_deg_matrix_ecef(
+    p_ecef_m: np.ndarray,
+    stations: Sequence[StationLike],
+    mask: np.ndarray | None = None,
+    fill_deg: float = -90.0,
+) -> np.ndarray:
+    """
+    elevation_deg_matrix for an ECEF track (T, 3) in meters.
+
+    With an (N, T) bool mask only the True (station, sample) pairs are
+    computed; the rest are set to fill_deg. Use it with a prefilter that
+    guarantees masked-out pairs are below the horizon.
+    """
+    prepared = [as_prepared_station(gs) for gs in stations]
+    p = np.asarray(p_ecef_m, dtype=float)                                        # (T, 3)
+    S = np.array([ps.ecef_m for ps in prepared], dtype=float).reshape(-1, 3)      # (N, 3)
+    U = np.array([ps.enu_rows[2] for ps in prepared], dtype=float).reshape(-1, 3)  # (N, 3)
+
+    if mask is None:
+        # u = (p - s) . up ; |p - s|^2 = |p|^2 - 2 p.s + |s|^2
+        up = U @ p.T - np.sum(S * U, axis=1)[:, None]
+        rng2 = np.sum(p * p, axis=1)[None, :] - 2.0 * (S @ p.T) + np.sum(S * S, axis=1)[:, None]
+        horiz = np.sqrt(np.maximum(rng2 - up * up, 0.0))
+        return np.degrees(np.arctan2(up, horiz))
+
+    out = np.full((len(prepared), p.shape[0]), fill_deg)
+    k, t = np.nonzero(mask)
+    d = p[t] - S[k]
+    up = np.einsum("ij,ij->i", d, U[k])
+    horiz = np.sqrt(np.maximum(np.einsum("ij,ij->i", d, d) - up * up, 0.0))
+    out[k, t] = np.degrees(np.arctan2(up, horiz))
+    return out
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timedelta
+
+from app.orbit.ephemeris_store import DEFAULT_STORE_DIR, EphemerisStore
+from app.scripts.generate_passes_7d_batched import load_latest_tles, utcnow
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Propagate satellites once into a memory-mapped ephemeris store")
+    ap.add_argument("--dir", default=DEFAULT_STORE_DIR, help=f"Store directory (default {DEFAULT_STORE_DIR}, env EPHEMERIS_DIR)")
+    ap.add_argument("--days", type=int, default=7)
+    ap.add_argument("--step", type=int, default=60, help="Sample cadence seconds (default 60; generator --step should be a multiple)")
+    ap.add_argument("--satellite-id", type=int, default=None, help="Store one satellite id (DB id)")
+    ap.add_argument("--sat-limit", type=int, default=1, help="How many satellites to store (default 1)")
+    args = ap.parse_args()
+
+    # align to the minute so consecutive builds share a sample grid
+    start = utcnow().replace(second=0, microsecond=0)
+    end = start + timedelta(days=args.days)
+
+    sats = load_latest_tles(args.sat_limit, args.satellite_id)
+    store = EphemerisStore(args.dir)
+
+    t0 = time.perf_counter()
+    name, written = store.build(sats, start, end, args.step)
+    wall = time.perf_counter() - t0
+
+    count = int((end - start) // timedelta(seconds=args.step)) + 1
+    mb = written * count * 6 * 8 / 1e6
+    print(f"[win] {start.isoformat()} -> {end.isoformat()} | step={args.step}s | samples={count}")
+    print(f"[store] {args.dir}/{name} | satellites={written}/{len(sats)} | {mb:.1f} MB | {wall:.1f}s")
+    print(f"[index] entries={len(store.index)}")
+    print("[done]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Capture EXPLAIN (ANALYZE, BUFFERS) for the pass query endpoints.
+
+Runs the exact WHERE clause the API uses (OVERLAP_SQL / overlap_params from
+app.db.pass_queries) for:
+  passes     GET /passes             (one station, ORDER BY start_ts LIMIT)
+  schedule   GET /schedule/best      (one station, ORDER BY end_ts)
+  network    GET /network/schedule/best (all stations)
+and writes the plans to --out.
+
+--populate-rows N first loads a synthetic table of ~N passes (synthetic
+satellites x existing ground stations, built server-side with generate_series)
+and runs VACUUM (ANALYZE) so index-only scans are possible; --cleanup removes it.
+
+  py -3.12 -m app.scripts.capture_passes_explain --populate-rows 10000000
+  py -3.12 -m app.scripts.capture_passes_explain --out docs/benchmarks/passes_explain.txt
+  py -3.12 -m app.scripts.capture_passes_explain --cleanup
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import psycopg
+
+from app.core.config import DATABASE_URL
+from app.db.conn import get_conn
+from app.db.partitions import ensure_partitions
+from app.db.pass_queries import OVERLAP_SQL, overlap_params
+
+
+OUT_DEFAULT = Path("docs/benchmarks/passes_explain_10m.txt")
+
+# synthetic satellites live above every real NORAD id
+SYNTH_NORAD_BASE = 900_000
+SYNTH_NAME_PREFIX = "SYNTH-"
+
+SYNTH_DAYS = 7
+PASSES_PER_PAIR_PER_DAY = 4
+SYNTH_MAX_DURATION_S = 900
+SATS_PER_BATCH = 200
+
+_SELECT = "SELECT id, satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg FROM passes"
+
+_INSERT_SATELLITES_SQL = """
+INSERT INTO satellites (norad_id, name)
+SELECT %(base)s + g, %(prefix)s || g
+FROM generate_series(1, %(n)s) g
+ON CONFLICT (norad_id) DO NOTHING
+"""
+
+# Per (satellite, station): one pass in each slot of slot_s seconds, start jittered
+# inside the slot so passes never overlap; duration 4-15 min, elevation 10-90 deg.
+_INSERT_PASSES_SQL = """
+INSERT INTO passes (satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg)
+SELECT s.id, gs.id, t.start_ts, t.start_ts + make_interval(secs => t.dur), t.dur, t.elev
+FROM satellites s
+CROSS JOIN (SELECT id FROM ground_stations ORDER BY id LIMIT %(gs_limit)s) gs
+CROSS JOIN LATERAL (
+    SELECT
+        %(t0)s::timestamptz
+            + make_interval(secs => k * %(slot_s)s + floor(random() * (%(slot_s)s - %(max_dur)s))) AS start_ts,
+        (240 + floor(random() * (%(max_dur)s - 240)))::int AS dur,
+        10 + random() * 80 AS elev
+    FROM generate_series(0, %(per_pair)s - 1) k
+) t
+WHERE s.norad_id > %(lo)s AND s.norad_id <= %(hi)s
+ON CONFLICT (satellite_id, ground_station_id, start_ts, end_ts) DO NOTHING
+"""
+
+
+def _station_count(gs_limit: int) -> int:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM (SELECT 1 FROM ground_stations LIMIT %s) x", (gs_limit,))
+            return int(cur.fetchone()[0])
+
+
+def _vacuum_analyze() -> None:
+    # VACUUM cannot run inside a transaction block (pool connections always open one)
+    with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+        conn.execute("VACUUM (ANALYZE) passes")
+
+
+def populate(rows: int, gs_limit: int, t0: datetime) -> None:
+    n_gs = _station_count(gs_limit)
+    if n_gs == 0:
+        raise RuntimeError("No ground stations found. Run seed_ground_stations first.")
+
+    per_pair = SYNTH_DAYS * PASSES_PER_PAIR_PER_DAY
+    slot_s = 86400 // PASSES_PER_PAIR_PER_DAY
+    n_sats = math.ceil(rows / (n_gs * per_pair))
+    print(f"[populate] stations={n_gs} satellites={n_sats} passes_per_pair={per_pair} target_rows={n_sats * n_gs * per_pair}")
+
+    created = ensure_partitions(t0.date(), (t0 + timedelta(days=SYNTH_DAYS)).date())
+    print(f"[populate] partitions_created={len(created)}")
+
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(_INSERT_SATELLITES_SQL, {"base": SYNTH_NORAD_BASE, "prefix": SYNTH_NAME_PREFIX, "n": n_sats})
+
+    inserted = 0
+    t_start = time.perf_counter()
+    for lo in range(0, n_sats, SATS_PER_BATCH):
+        hi = min(lo + SATS_PER_BATCH, n_sats)
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    _INSERT_PASSES_SQL,
+                    {
+                        "gs_limit": gs_limit,
+                        "t0": t0,
+                        "slot_s": slot_s,
+                        "max_dur": SYNTH_MAX_DURATION_S,
+                        "per_pair": per_pair,
+                        "lo": SYNTH_NORAD_BASE + lo,
+                        "hi": SYNTH_NORAD_BASE + hi,
+                    },
+                )
+                inserted += cur.rowcount
+        print(f"[populate] satellites={hi}/{n_sats} inserted={inserted} elapsed_s={time.perf_counter() - t_start:.1f}")
+
+    t_vac = time.perf_counter()
+    _vacuum_analyze()
+    print(f"[populate] vacuum_analyze_s={time.perf_counter() - t_vac:.1f}")
+
+
+def cleanup() -> None:
+    # passes go with their satellites (ON DELETE CASCADE)
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM satellites WHERE norad_id > %s", (SYNTH_NORAD_BASE,))
+            print(f"[cleanup] satellites_deleted={cur.rowcount}")
+    _vacuum_analyze()
+
+
+def queries(gs_id: int, qstart: datetime, qend: datetime, limit: int) -> list[tuple[str, str, tuple]]:
+    params = overlap_params(qstart, qend)
+    return [
+        (
+            "passes",
+            f"{_SELECT} WHERE ground_station_id = %s AND {OVERLAP_SQL} ORDER BY start_ts LIMIT %s",
+            (gs_id, *params, limit),
+        ),
+        (
+            "schedule",
+            f"{_SELECT} WHERE ground_station_id = %s AND {OVERLAP_SQL} ORDER BY end_ts ASC",
+            (gs_id, *params),
+        ),
+        (
+            "network",
+            f"{_SELECT} WHERE {OVERLAP_SQL} ORDER BY ground_station_id ASC, end_ts ASC",
+            params,
+        ),
+    ]
+
+
+def explain(query: str, params: tuple) -> str:
+    with get_conn() as conn:
+        # ClientCursor inlines the values into the statement (the default cursor sends
+        # them separately), so the plan is a custom plan for these values and its
+        # filters show them instead of $n
+        with psycopg.ClientCursor(conn) as cur:
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params)
+            return "\n".join(r[0] for r in cur.fetchall())
+
+
+def header() -> str:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SHOW server_version")
+            version = cur.fetchone()[0]
+            cur.execute("SELECT count(*) FROM passes")
+            total = int(cur.fetchone()[0])
+            cur.execute("SELECT count(*) FROM pg_inherits WHERE inhparent = 'passes'::regclass")
+            parts = int(cur.fetchone()[0])
+    return (
+        f"# captured_at={datetime.now(timezone.utc).isoformat(timespec='seconds')} "
+        f"postgres={version} passes_rows={total} partitions={parts}"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--gs-id", type=int, default=1)
+    ap.add_argument("--start", default=None, help="ISO window start (default: now, UTC)")
+    ap.add_argument("--hours", type=float, default=24.0, help="Window length")
+    ap.add_argument("--limit", type=int, default=200, help="/passes LIMIT")
+    ap.add_argument("--populate-rows", type=int, default=0, help="Load ~N synthetic passes first (0 = use existing data)")
+    ap.add_argument("--gs-limit", type=int, default=50, help="Stations used for synthetic passes")
+    ap.add_argument("--cleanup", action="store_true", help="Delete synthetic satellites/passes and exit")
+    ap.add_argument("--out", default=str(OUT_DEFAULT))
+    args = ap.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+
+    qstart = datetime.fromisoformat(args.start) if args.start else datetime.now(timezone.utc)
+    if qstart.tzinfo is None:
+        qstart = qstart.replace(tzinfo=timezone.utc)
+    qstart = qstart.astimezone(timezone.utc)
+    qend = qstart + timedelta(hours=args.hours)
+
+    if args.populate_rows > 0:
+        t0 = qstart.replace(hour=0, minute=0, second=0, microsecond=0)
+        populate(args.populate_rows, args.gs_limit, t0)
+
+    sections = [header(), f"# gs_id={args.gs_id} start={qstart.isoformat()} end={qend.isoformat()} limit={args.limit}"]
+    for name, query, params in queries(args.gs_id, qstart, qend, args.limit):
+        plan = explain(query, params)
+        sections.append(f"\n## {name}\n{plan}")
+        last = plan.strip().splitlines()[-1]
+        print(f"[explain] {name} | {last.strip()}")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text("\n".join(sections) + "\n", encoding="utf-8")
+    print(f"[out] {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Chebyshev ephemeris vs direct SGP4: accuracy and speed.
+
+No database needed; defaults to an ISS TLE. Example:
+  py -3.12 -m app.scripts.ephemeris_benchmark --days 7 --stations 50
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.orbit.ephemeris import DEFAULT_DEGREE, DEFAULT_TOL_KM, ChebyshevEphemeris
+from app.orbit.pass_prediction import predict_passes
+from app.orbit.satrec_cache import get_satrec
+from app.orbit.visibility import GroundStation, prepare_station
+
+
+ISS_LINE1 = "1 25544U 98067A   19343.69339541  .00001764  00000-0  38792-4 0  9991"
+ISS_LINE2 = "2 25544  51.6439 211.2001 0007417  17.6667  85.6398 15.50103472202482"
+
+
+def _timed(fn, repeat: int = 3):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _stations(n: int) -> list:
+    # spread over latitudes/longitudes, prepared once like the generators do
+    return [
+        prepare_station(GroundStation(lat_deg=-60.0 + 120.0 * k / max(1, n - 1), lon_deg=(k * 47.0) % 360.0 - 180.0))
+        for k in range(n)
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--line1", default=ISS_LINE1)
+    ap.add_argument("--line2", default=ISS_LINE2)
+    ap.add_argument("--start", default=None, help="ISO UTC start (default: TLE epoch)")
+    ap.add_argument("--days", type=float, default=7.0)
+    ap.add_argument("--degree", type=int, default=DEFAULT_DEGREE)
+    ap.add_argument("--tol-km", type=float, default=DEFAULT_TOL_KM)
+    ap.add_argument("--samples", type=int, default=200000, help="Random instants for accuracy/array timing")
+    ap.add_argument("--stations", type=int, default=20, help="Stations for the predict_passes comparison")
+    ap.add_argument("--step", type=int, default=60)
+    args = ap.parse_args()
+
+    sat = get_satrec(args.line1, args.line2)
+    if args.start:
+        start = datetime.fromisoformat(args.start).astimezone(timezone.utc)
+    else:
+        epoch_jd = sat.jdsatepoch + sat.jdsatepochF
+        start = datetime(2000, 1, 1, 12, tzinfo=timezone.utc) + timedelta(days=epoch_jd - 2451545.0)
+        start = start.replace(microsecond=0)
+    end = start + timedelta(days=args.days)
+
+    # ---- fit ----
+    fit_s, eph = _timed(lambda: ChebyshevEphemeris.fit(sat, start, end, degree=args.degree, tol_km=args.tol_km), repeat=1)
+    print(f"[fit] {start.isoformat()} -> {end.isoformat()} | degree={args.degree} tol={args.tol_km} km")
+    print(f"[fit] segments={eph.coef.shape[0]} segment={eph.segment_s:.0f}s | check_err={eph.max_error_km:.3e} km | {fit_s * 1000:.1f} ms")
+
+    # ---- accuracy vs SGP4 on random instants ----
+    x = np.sort(np.random.default_rng(0).uniform(0.0, eph.span_s, args.samples))
+    jd = np.full(x.size, eph.epoch.jd)
+    fr = eph.epoch.fr + x / 86400.0
+    _e, r_ref, _v = sat.sgp4_array(jd, fr)
+    _e, r_fit, _v = eph.sgp4_array(jd, fr)
+    d = np.linalg.norm(r_fit - r_ref, axis=1)
+    print(f"[acc] n={x.size} | max={d.max() * 1e3:.4f} m | rms={np.sqrt(np.mean(d * d)) * 1e3:.4f} m")
+
+    # ---- array lookups ----
+    t_sgp4, _ = _timed(lambda: sat.sgp4_array(jd, fr))
+    t_cheb, _ = _timed(lambda: eph.sgp4_array(jd, fr))
+    print(
+        f"[array] sgp4_array={t_sgp4 / x.size * 1e9:.0f} ns/pt | chebyshev={t_cheb / x.size * 1e9:.0f} ns/pt "
+        f"| speedup={t_sgp4 / t_cheb:.1f}x"
+    )
+
+    # ---- scalar lookups (eph.sgp4 forwards to SGP4; position_km is the polynomial) ----
+    n_scalar = min(20000, x.size)
+    pts = list(zip(jd[:n_scalar].tolist(), fr[:n_scalar].tolist()))
+    xs = x[:n_scalar].tolist()
+    t_sgp4_s, _ = _timed(lambda: [sat.sgp4(a, b) for a, b in pts])
+    t_cheb_s, _ = _timed(lambda: [eph.position_km(v) for v in xs])
+    print(
+        f"[scalar] sgp4={t_sgp4_s / n_scalar * 1e6:.2f} us | chebyshev position_km={t_cheb_s / n_scalar * 1e6:.2f} us "
+        f"| speedup={t_sgp4_s / t_cheb_s:.2f}x"
+    )
+
+    # ---- predict_passes, same fit reused for every station ----
+    stations = _stations(args.stations)
+    for mode in ("vector", "scalar"):
+        t_ref, ref = _timed(
+            lambda: [predict_passes(args.line1, args.line2, gs, start, end, args.step, mode=mode) for gs in stations],
+            repeat=1,
+        )
+        t_eph, got = _timed(
+            lambda: [
+                predict_passes(args.line1, args.line2, gs, start, end, args.step, mode=mode, ephemeris=eph)
+                for gs in stations
+            ],
+            repeat=1,
+        )
+        n_ref = sum(len(p) for p in ref)
+        n_got = sum(len(p) for p in got)
+        same = n_ref == n_got and all(len(a) == len(b) for a, b in zip(ref, got))
+        dt_max = 0.0
+        if same:
+            dt_max = max(
+                (
+                    max(abs((a.start_ts - b.start_ts).total_seconds()), abs((a.end_ts - b.end_ts).total_seconds()))
+                    for pa, pb in zip(ref, got)
+                    for a, b in zip(pa, pb)
+                ),
+                default=0.0,
+            )
+        print(
+            f"[passes {mode}] stations={len(stations)} | sgp4={t_ref:.2f}s | chebyshev={t_eph:.2f}s (+fit {fit_s:.2f}s) "
+            f"| passes={n_ref}/{n_got} | max_rise_set_diff={dt_max * 1000:.3f} ms"
+        )
+
+    print("[done]")
+
+
+if __name__ == "__main__":
+    main()
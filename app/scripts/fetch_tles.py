@@ -148,7 +148,14 @@ def main():
                 )
                 tle_inserts += 1
 
+                # flag the satellite for pass regeneration (generate_passes_7d_batched --changed-only)
+                cur.execute(
+                    "UPDATE satellites SET tle_changed_at = now() WHERE id = %s",
+                    (sat_id,),
+                )
+
     print(f"[db] satellites_upserted={sat_upserts} tles_inserted={tle_inserts} skipped={tle_skips}")
+    print(f"[db] satellites_changed={tle_inserts} (picked up by generate_passes_7d_batched --changed-only)")
     print("[done]")
 
 
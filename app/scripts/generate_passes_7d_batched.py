@@ -1,13 +1,31 @@
 from __future__ import annotations
 
 import argparse
+import math
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from psycopg.rows import dict_row
 
+from app.core.config import PASS_MAX_DURATION_S
 from app.db.conn import get_conn
-from app.orbit.visibility import GroundStation
-from app.orbit.pass_prediction import predict_passes
+from app.db.pass_writer import DELETE_OVERLAPPING_SQL, PASS_OWNER_SQL, write_passes
+from app.orbit.ephemeris_store import EphemerisStore
+from app.orbit.visibility import GroundStation, PreparedStation, get_prepared_station
+from app.orbit.pass_prediction import DEFAULT_STREAM_BLOCK_SAMPLES, PassScanner, PassWindow
+from app.orbit.satrec_cache import get_satrec, satrec_cache_info
+from app.orbit.station_index import StationIndex
+
+
+# Passes still in progress at the end of a generated window are not stored
+# (they have no set yet), so an incremental tail is recomputed from before
+# their rise: tail_lookback() orbital periods before covered_end. A single
+# visibility window stays under one period except near-synchronous orbits
+# (fixtures: GPS 11.8 h of 12.0 h, Molniya 11.4 h of 12.0 h), hence two.
+TAIL_LOOKBACK_ORBITS = 2
 
 
 def utcnow() -> datetime:
@@ -32,14 +50,15 @@ def load_ground_stations(gs_limit: int):
 def load_latest_tles(sat_limit: int, satellite_id: int | None):
     """
     Returns list of rows:
-      {satellite_id, norad_id, name, line1, line2}
+      {satellite_id, norad_id, name, tle_id, tle_fetched_at, line1, line2}
     """
     with get_conn() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             if satellite_id is not None:
                 cur.execute(
                     """
-                    SELECT s.id AS satellite_id, s.norad_id, s.name, t.line1, t.line2
+                    SELECT s.id AS satellite_id, s.norad_id, s.name,
+                           t.id AS tle_id, t.fetched_at AS tle_fetched_at, t.line1, t.line2
                     FROM tles t
                     JOIN satellites s ON s.id = t.satellite_id
                     WHERE s.id = %s
@@ -57,7 +76,8 @@ def load_latest_tles(sat_limit: int, satellite_id: int | None):
             cur.execute(
                 """
                 SELECT DISTINCT ON (t.satellite_id)
-                    s.id AS satellite_id, s.norad_id, s.name, t.line1, t.line2
+                    s.id AS satellite_id, s.norad_id, s.name,
+                    t.id AS tle_id, t.fetched_at AS tle_fetched_at, t.line1, t.line2
                 FROM tles t
                 JOIN satellites s ON s.id = t.satellite_id
                 ORDER BY t.satellite_id, t.fetched_at DESC
@@ -71,36 +91,480 @@ def load_latest_tles(sat_limit: int, satellite_id: int | None):
             return rows
 
 
-def delete_existing_passes(sat_id: int, start: datetime, end: datetime) -> int:
+def load_tle(tle_id: int) -> dict:
+    """One stored TLE by id, same row shape as load_latest_tles (pass_jobs pin their TLE)."""
+    with get_conn() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT s.id AS satellite_id, s.norad_id, s.name,
+                       t.id AS tle_id, t.fetched_at AS tle_fetched_at, t.line1, t.line2
+                FROM tles t
+                JOIN satellites s ON s.id = t.satellite_id
+                WHERE t.id = %s
+                """,
+                (tle_id,),
+            )
+            row = cur.fetchone()
+            if not row:
+                raise RuntimeError(f"TLE {tle_id} not found.")
+            return row
+
+
+def load_changed_tles(sat_limit: int, satellite_id: int | None = None):
+    """
+    Latest TLE of satellites whose elements changed since their passes were
+    last generated (fetch_tles sets tle_changed_at), most stale first.
+    With satellite_id, only that satellite (if it changed).
+    Same row shape as load_latest_tles; may be empty.
+    """
+    with get_conn() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT s.id AS satellite_id, s.norad_id, s.name,
+                       t.id AS tle_id, t.fetched_at AS tle_fetched_at, t.line1, t.line2
+                FROM satellites s
+                JOIN LATERAL (
+                    SELECT id, fetched_at, line1, line2
+                    FROM tles
+                    WHERE satellite_id = s.id
+                    ORDER BY fetched_at DESC
+                    LIMIT 1
+                ) t ON TRUE
+                WHERE s.tle_changed_at IS NOT NULL
+                  AND (s.passes_generated_at IS NULL OR s.tle_changed_at > s.passes_generated_at)
+                  AND (%s::bigint IS NULL OR s.id = %s::bigint)
+                ORDER BY s.passes_generated_at ASC NULLS FIRST, s.tle_changed_at ASC
+                LIMIT %s
+                """,
+                (satellite_id, satellite_id, sat_limit),
+            )
+            return cur.fetchall()
+
+
+def mark_passes_generated(sats: list[dict]) -> None:
+    """
+    Stamp passes_generated_at with the fetched_at of the TLE each satellite's
+    passes came from. fetch_tles sets tle_changed_at to the fetched_at of the
+    TLE it inserts (same transaction, same now()), so a satellite stays
+    flagged exactly while a newer TLE than the one used exists - whatever the
+    generator's clock says, and even if that TLE commits while this run is
+    still computing.
+    """
+    if not sats:
+        return
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
+                UPDATE satellites s
+                SET passes_generated_at = v.tle_fetched_at
+                FROM unnest(%s::bigint[], %s::timestamptz[]) AS v(satellite_id, tle_fetched_at)
+                WHERE s.id = v.satellite_id
+                """,
+                ([sat["satellite_id"] for sat in sats], [sat["tle_fetched_at"] for sat in sats]),
+            )
+
+
+def delete_existing_passes(sat_id: int, start: datetime, end: datetime) -> int:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(DELETE_OVERLAPPING_SQL, {"sat": sat_id, "start": start, "end": end})
+            return cur.rowcount
+
+
+def delete_passes_from(sat_id: int, from_ts: datetime) -> int:
+    # a scan from from_ts re-finds every pass rising at/after it, so that is exactly what gets
+    # replaced; segments of a pass that rose earlier are kept (the scan skips that pass)
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
                 DELETE FROM passes
                 WHERE satellite_id = %s
-                  AND start_ts < %s
-                  AND end_ts > %s
+                  AND start_ts >= %s
+                  AND {PASS_OWNER_SQL} >= %s
                 """,
-                (sat_id, end, start),
+                (sat_id, from_ts, from_ts),
             )
             return cur.rowcount
 
 
-def insert_pass_rows(rows: list[tuple]) -> None:
-    if not rows:
-        return
+def clear_existing_passes(args, sat_id: int, start: datetime, end: datetime) -> int:
+    """
+    Passes a non-incremental run removes before writing a satellite's window.
+    --changed-only always replaces everything from start onward: passes from
+    the old TLE have slightly different times, so the unique key would not
+    stop them from piling up next to the new ones.
+    """
+    deleted = 0
+    if args.delete_existing:
+        deleted += delete_existing_passes(sat_id, start, end)
+    if args.changed_only:
+        deleted += delete_passes_from(sat_id, start)
+    return deleted
+
+
+def load_coverage(sat_id: int, tle_id: int):
+    with get_conn() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT covered_start, covered_end
+                FROM pass_coverage
+                WHERE satellite_id = %s AND tle_id = %s
+                """,
+                (sat_id, tle_id),
+            )
+            return cur.fetchone()
+
+
+def upsert_coverage(sat_id: int, tle_id: int, covered_start: datetime, covered_end: datetime) -> None:
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.executemany(
+            # coverage from an older TLE no longer describes what is stored
+            cur.execute(
+                "DELETE FROM pass_coverage WHERE satellite_id = %s AND tle_id <> %s",
+                (sat_id, tle_id),
+            )
+            cur.execute(
                 """
-                INSERT INTO passes (satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON CONFLICT (satellite_id, ground_station_id, start_ts, end_ts) DO NOTHING
+                INSERT INTO pass_coverage (satellite_id, tle_id, covered_start, covered_end)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (satellite_id, tle_id) DO UPDATE
+                SET covered_start = EXCLUDED.covered_start,
+                    covered_end = EXCLUDED.covered_end,
+                    updated_at = now()
                 """,
-                rows,
+                (sat_id, tle_id, covered_start, covered_end),
             )
 
 
+def tail_lookback(sat: dict) -> timedelta:
+    """
+    How far before covered_end an incremental tail scan restarts for this
+    satellite: TAIL_LOOKBACK_ORBITS orbital periods, capped at
+    PASS_MAX_DURATION_S (the longest pass the API window queries look back for).
+    """
+    satrec = get_satrec(sat["line1"], sat["line2"])
+    period_s = 2.0 * math.pi / (satrec.no_kozai / 60.0)  # no_kozai is rad/min
+    return timedelta(seconds=min(TAIL_LOOKBACK_ORBITS * period_s, PASS_MAX_DURATION_S))
+
+
+def plan_incremental(sat: dict, start: datetime, end: datetime) -> tuple[datetime, datetime] | None:
+    """
+    (window_start, scan_from) for an incremental run, or None if [start, end]
+    is already covered with this TLE.
+
+    If the stored coverage (same satellite + TLE) contains `start`, only the
+    tail after covered_end (minus tail_lookback) is computed and coverage keeps
+    its original start. Otherwise - new TLE, first run, or a gap - the whole
+    window is recomputed.
+    """
+    cov = load_coverage(sat["satellite_id"], sat["tle_id"])
+    if cov and cov["covered_start"] <= start < cov["covered_end"]:
+        if cov["covered_end"] >= end:
+            return None
+        scan_from = max(cov["covered_start"], cov["covered_end"] - tail_lookback(sat))
+        return cov["covered_start"], scan_from
+
+    return start, start
+
+
+def apply_incremental_plan(sats: list[dict], start: datetime, end: datetime) -> list[dict]:
+    """
+    Plan every satellite for an incremental run and clear what will be recomputed.
+    Returns the satellites that still need work, with window_start / scan_from set.
+    """
+    todo = []
+    for sat in sats:
+        plan = plan_incremental(sat, start, end)
+        if plan is None:
+            print(f"[inc] sat={sat['satellite_id']} covered -> skip")
+            continue
+
+        window_start, scan_from = plan
+        if scan_from == start:
+            # new TLE (or a gap): nothing stored from start onward is kept, including
+            # passes past `end` left by an earlier, longer run with the old TLE
+            deleted = delete_existing_passes(sat["satellite_id"], start, end)
+            deleted += delete_passes_from(sat["satellite_id"], start)
+            with get_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("DELETE FROM pass_coverage WHERE satellite_id = %s", (sat["satellite_id"],))
+            print(f"[inc] sat={sat['satellite_id']} full window | deleted={deleted}")
+        else:
+            deleted = delete_passes_from(sat["satellite_id"], scan_from)
+            # keep coverage truthful in case this run dies before the tail is written
+            upsert_coverage(sat["satellite_id"], sat["tle_id"], window_start, scan_from)
+            print(f"[inc] sat={sat['satellite_id']} tail from {scan_from.isoformat()} | deleted={deleted}")
+
+        todo.append({**sat, "window_start": window_start, "scan_from": scan_from})
+    return todo
+
+
+def insert_pass_rows(rows: list[tuple]) -> tuple[int, int]:
+    """COPY + merge (app.db.pass_writer). Returns (inserted, skipped as duplicates)."""
+    if not rows:
+        return 0, 0
+    return write_passes(rows)
+
+
+def build_prepared_stations(stations: list[dict]) -> list[PreparedStation]:
+    # station geometry (ECEF + ENU rotation) prepared once for the whole run
+    return [
+        get_prepared_station(
+            gs_row["id"],
+            GroundStation(
+                lat_deg=float(gs_row["lat"]),
+                lon_deg=float(gs_row["lon"]),
+                alt_m=float(gs_row["alt_m"]),
+            ),
+        )
+        for gs_row in stations
+    ]
+
+
+def _add_rows(
+    sat_id: int,
+    stations: list[dict],
+    by_station: list[list[PassWindow]],
+    out: list[list[tuple]],
+    before: datetime | None = None,
+    since: datetime | None = None,
+) -> None:
+    # rows are (satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg);
+    # with `before` / `since`, only passes starting before / at or after it
+    for gi, (gs_row, predicted) in enumerate(zip(stations, by_station)):
+        for p in predicted:
+            if (before is None or p.start_ts < before) and (since is None or p.start_ts >= since):
+                out[gi].append((sat_id, gs_row["id"], p.start_ts, p.end_ts, p.duration_s, float(p.max_elev_deg)))
+
+
+def predict_chunk_rows(
+    sat: dict,
+    stations: list[dict],
+    stations_gs: list[PreparedStation],
+    chunk_start: datetime,
+    chunk_end: datetime,
+    window_end: datetime,
+    step: int,
+    mode: str,
+    index: StationIndex | None = None,
+) -> list[list[tuple]]:
+    """
+    Rows of the passes that START in [chunk_start, chunk_end), one list per
+    station, for pass_job_worker (jobs share no scan state).
+
+    A PassScanner starts at chunk_start, so a pass already up there is
+    skipped: it belongs to the previous chunk. After chunk_end the scan only
+    continues while a pass that rose inside the chunk is still up (never past
+    window_end), so every pass is computed by exactly one chunk, with no
+    margin rescans and no de-duplication.
+    """
+    scanner = PassScanner(
+        get_satrec(sat["line1"], sat["line2"]),
+        stations_gs,
+        chunk_start,
+        step_seconds=step,
+        cutoff_deg=0.0,
+        min_duration_s=5,
+        index=index,
+        mode=mode,
+        end=window_end,
+    )
+    station_rows: list[list[tuple]] = [[] for _ in stations]
+
+    until = min(chunk_end, window_end)
+    _add_rows(sat["satellite_id"], stations, scanner.advance(until), station_rows, before=chunk_end)
+
+    tail_block = timedelta(seconds=step * DEFAULT_STREAM_BLOCK_SAMPLES)
+    while until < window_end and any(t is not None and t < chunk_end for t in scanner.pass_starts()):
+        until = min(until + tail_block, window_end)
+        _add_rows(sat["satellite_id"], stations, scanner.advance(until), station_rows, before=chunk_end)
+
+    return station_rows
+
+
+def predict_satellite_rows(
+    sat: dict,
+    stations: list[dict],
+    stations_gs: list[PreparedStation],
+    start: datetime,
+    end: datetime,
+    chunk_hours: int,
+    step: int,
+    mode: str,
+    index: StationIndex | None = None,
+    store: EphemerisStore | None = None,
+) -> list[list[tuple]]:
+    """
+    Pass rows for one satellite over [start, end], one list per station.
+
+    A PassScanner (any --mode) consumes the window chunk by chunk; scan state
+    carries over between chunks, so there is no margin rescan and no
+    de-duplication. Passes in progress at start or end are skipped.
+
+    With an ephemeris store holding this satellite's current TLE (vector mode),
+    the grid is read from the memmap; only refinement and samples past the
+    stored range call SGP4. The store's grid is not aligned to start, so the
+    scan runs from the stored sample at or before start to one step past end
+    and keeps the passes that rise in [start, end) and set by end: callers
+    delete and re-own passes from start onward only.
+    """
+    station_rows: list[list[tuple]] = [[] for _ in stations]
+
+    source = get_satrec(sat["line1"], sat["line2"])
+    scan_start, scan_end = start, end
+    stored = store.get(sat["satellite_id"], sat.get("tle_id")) if store is not None and mode == "vector" else None
+    if stored is not None and stored.start <= start < stored.end:
+        source = stored
+        scan_start = stored.align(start)
+        scan_end = end + timedelta(seconds=step)
+
+    scanner = PassScanner(
+        source,
+        stations_gs,
+        scan_start,
+        step_seconds=step,
+        cutoff_deg=0.0,
+        min_duration_s=5,
+        index=index,
+        mode=mode,
+        end=scan_end,
+    )
+
+    # chunks only bound the size of each scanned block
+    chunk_end = scan_start
+    while chunk_end < scan_end:
+        chunk_end = min(chunk_end + timedelta(hours=chunk_hours), scan_end)
+        _add_rows(sat["satellite_id"], stations, scanner.advance(chunk_end), station_rows, before=end, since=start)
+
+    if scan_end > end:
+        station_rows = [[r for r in rows if r[3] <= end] for rows in station_rows]
+    return station_rows
+
+
+# ----------------------------
+# Process-pool workers (--workers N)
+# ----------------------------
+
+# per-worker state, filled once by _worker_init
+_W: dict = {}
+
+
+def _worker_init(
+    sats: list[dict],
+    station_blocks: list[list[dict]],
+    start: datetime,
+    end: datetime,
+    cfg: dict,
+) -> None:
+    """
+    Runs once per worker process: TLEs and station geometry (and the optional
+    prefilter index per station block) are set up here, not per work unit.
+    """
+    blocks = []
+    for block in station_blocks:
+        block_gs = build_prepared_stations(block)
+        index = (
+            StationIndex(station_ids=[r["id"] for r in block], stations=block_gs)
+            if cfg["prefilter"]
+            else None
+        )
+        blocks.append((block, block_gs, index))
+
+    store = EphemerisStore(cfg["ephemeris_dir"]) if cfg.get("ephemeris_dir") else None
+    _W.update(sats=sats, blocks=blocks, start=start, end=end, cfg=cfg, store=store)
+
+
+def _worker_run(unit: tuple[int, int]) -> dict:
+    """Work unit = (satellite position, station block number)."""
+    si, bi = unit
+    block, block_gs, index = _W["blocks"][bi]
+    cfg = _W["cfg"]
+
+    sat = _W["sats"][si]
+
+    t0 = time.perf_counter()
+    station_rows = predict_satellite_rows(
+        sat,
+        block,
+        block_gs,
+        sat.get("scan_from", _W["start"]),
+        _W["end"],
+        cfg["chunk_hours"],
+        cfg["step"],
+        cfg["mode"],
+        index,
+        _W["store"],
+    )
+    return {
+        "unit": unit,
+        "pid": os.getpid(),
+        "elapsed_s": time.perf_counter() - t0,
+        "rows": [r for rows in station_rows for r in rows],
+    }
+
+
+def run_parallel(args, sats: list[dict], stations: list[dict], start: datetime, end: datetime) -> None:
+    """
+    Split (satellite, station-block) work units across a process pool.
+    Results come back in submission order (executor.map), so the single
+    writer here inserts in the same deterministic order as a serial run.
+    """
+    block_size = args.station_block if args.station_block > 0 else len(stations)
+    station_blocks = [stations[i : i + block_size] for i in range(0, len(stations), block_size)]
+    units = [(si, bi) for si in range(len(sats)) for bi in range(len(station_blocks))]
+    cfg = {
+        "chunk_hours": args.chunk_hours,
+        "step": args.step,
+        "mode": args.mode,
+        "prefilter": args.prefilter,
+        "ephemeris_dir": args.ephemeris_dir,
+    }
+
+    print(f"[pool] workers={args.workers} | station_blocks={len(station_blocks)} | units={len(units)}")
+
+    if not args.incremental and (args.delete_existing or args.changed_only):
+        deleted = sum(clear_existing_passes(args, sat["satellite_id"], start, end) for sat in sats)
+        print(f"[db] deleted_existing={deleted}")
+
+    per_worker: dict[int, dict] = defaultdict(lambda: {"units": 0, "passes": 0, "busy_s": 0.0})
+    total = inserted = skipped = 0
+    t0 = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_worker_init,
+        initargs=(sats, station_blocks, start, end, cfg),
+    ) as ex:
+        for done, res in enumerate(ex.map(_worker_run, units), start=1):
+            ins, skip = insert_pass_rows(res["rows"])
+            inserted += ins
+            skipped += skip
+
+            w = per_worker[res["pid"]]
+            w["units"] += 1
+            w["passes"] += len(res["rows"])
+            w["busy_s"] += res["elapsed_s"]
+            total += len(res["rows"])
+
+            if done % 10 == 0 or done == len(units):
+                print(f"[prog] {done}/{len(units)} units | passes={total} | inserted={inserted} skipped={skipped}")
+
+    if args.incremental or args.delete_existing or args.changed_only:
+        for sat in sats:
+            upsert_coverage(sat["satellite_id"], sat["tle_id"], sat.get("window_start", start), end)
+
+    wall = time.perf_counter() - t0
+    print(f"\n[pool] wall={wall:.1f}s | passes={total} | {total / wall if wall else 0.0:.1f} passes/s")
+    for pid, w in sorted(per_worker.items()):
+        rate = w["passes"] / w["busy_s"] if w["busy_s"] else 0.0
+        print(f"[worker {pid}] units={w['units']} passes={w['passes']} busy={w['busy_s']:.1f}s ({rate:.1f} passes/s)")
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--days", type=int, default=7)
@@ -113,7 +577,14 @@ def main():
     # batching/perf
     ap.add_argument("--chunk-hours", type=int, default=24, help="Time chunk size (default 24h)")
     ap.add_argument("--step", type=int, default=60, help="Coarse scan step seconds (default 60)")
+    ap.add_argument("--mode", choices=["scalar", "vector", "adaptive"], default="vector", help="vector: propagate once for all stations (default); scalar/adaptive: per-station scan")
+    ap.add_argument("--prefilter", action="store_true", help="vector mode: only evaluate stations inside each satellite's visibility cone (pays off with hundreds+ stations)")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes (default 1 = serial)")
+    ap.add_argument("--station-block", type=int, default=0, help="Stations per work unit with --workers (default 0 = all)")
+    ap.add_argument("--ephemeris-dir", default=None, help="vector mode: read propagated grids from an ephemeris store (see build_ephemeris_store)")
     ap.add_argument("--delete-existing", action="store_true")
+    ap.add_argument("--changed-only", action="store_true", help="Only satellites whose TLE changed since their passes were last generated, most stale first (up to --sat-limit); their passes from now on are replaced")
+    ap.add_argument("--incremental", action="store_true", help="Only compute what pass_coverage says is missing for each satellite's current TLE (usually the newest tail)")
 
     args = ap.parse_args()
 
@@ -121,84 +592,62 @@ def main():
     end = start + timedelta(days=args.days)
 
     stations = load_ground_stations(args.gs_limit)
-    sats = load_latest_tles(args.sat_limit, args.satellite_id)
+    if args.changed_only:
+        sats = load_changed_tles(args.sat_limit, args.satellite_id)
+        print(f"[changed] sats_with_new_tle={len(sats)}")
+    else:
+        sats = load_latest_tles(args.sat_limit, args.satellite_id)
 
     print(f"[win] {start.isoformat()} -> {end.isoformat()} | days={args.days}")
-    print(f"[cfg] gs={len(stations)} | sats={len(sats)} | chunk_hours={args.chunk_hours} | step={args.step}s")
+    print(f"[cfg] gs={len(stations)} | sats={len(sats)} | chunk_hours={args.chunk_hours} | step={args.step}s | mode={args.mode}")
+
+    if args.incremental:
+        sats = apply_incremental_plan(sats, start, end)
+        print(f"[inc] sats_to_compute={len(sats)}")
+
+    if args.workers > 1:
+        run_parallel(args, sats, stations, start, end)
+        mark_passes_generated(sats)
+        print("[done]")
+        return
+
+    stations_gs = build_prepared_stations(stations)
+    index = StationIndex(station_ids=[r["id"] for r in stations], stations=stations_gs) if args.prefilter else None
+    store = EphemerisStore(args.ephemeris_dir) if args.ephemeris_dir else None
+    if store is not None:
+        print(f"[eph] store={args.ephemeris_dir} | satellites={len(store.index)}")
 
     for si, sat in enumerate(sats, start=1):
         sat_id = sat["satellite_id"]
         print(f"\n[sat {si}/{len(sats)}] {sat_id} | {sat['norad_id']} | {sat['name']}")
 
-        if args.delete_existing:
-            deleted = delete_existing_passes(sat_id, start, end)
+        if not args.incremental and (args.delete_existing or args.changed_only):
+            deleted = clear_existing_passes(args, sat_id, start, end)
             print(f"[db] deleted_existing={deleted}")
 
-        # per station, chunk the time range
-        for gi, gs_row in enumerate(stations, start=1):
-            gs = GroundStation(
-                lat_deg=float(gs_row["lat"]),
-                lon_deg=float(gs_row["lon"]),
-                alt_m=float(gs_row["alt_m"]),
-            )
-
-            chunk_start = start
-            station_pred = 0
-            station_rows: list[tuple] = []
-
-            while chunk_start < end:
-                chunk_end = min(chunk_start + timedelta(hours=args.chunk_hours), end)
-
-                # expand the chunk slightly so bisection/rise detection is stable at boundaries
-                margin = timedelta(minutes=10)
-                scan_start = max(start, chunk_start - margin)
-                scan_end = min(end, chunk_end + margin)
-
-                predicted = predict_passes(
-                    line1=sat["line1"],
-                    line2=sat["line2"],
-                    gs=gs,
-                    start=scan_start,
-                    end=scan_end,
-                    step_seconds=args.step,
-                    cutoff_deg=0.0,
-                    min_duration_s=5,
-                )
-
-                for p in predicted:
-                    # keep each pass only once based on where it STARTS
-                    keep = (p.start_ts >= chunk_start and p.start_ts < chunk_end)
-
-                    # special: if we start our whole window during a pass, include it once in the first chunk
-                    if chunk_start == start and (p.start_ts < start and p.end_ts > start):
-                        keep = True
-
-                    if not keep:
-                        continue
-
-                    # clip to [start,end]
-                    s = max(p.start_ts, start)
-                    e = min(p.end_ts, end)
-                    if e <= s:
-                        continue
-
-                    dur = int(round((e - s).total_seconds()))
-                    if dur < 5:
-                        continue
+        window_start = sat.get("window_start", start)
+        station_rows = predict_satellite_rows(
+            sat, stations, stations_gs, sat.get("scan_from", start), end, args.chunk_hours, args.step, args.mode, index, store
+        )
 
-                    station_rows.append(
-                        (sat_id, gs_row["id"], s, e, dur, float(p.max_elev_deg))
-                    )
-                    station_pred += 1
+        for gi in range(len(stations)):
+            if (gi + 1) % 5 == 0 or gi + 1 == len(stations):
+                print(f"[gs {gi + 1}/{len(stations)}] predicted={len(station_rows[gi])}")
 
-                chunk_start = chunk_end
+        # one COPY + merge per satellite instead of a connection per station
+        inserted, skipped = insert_pass_rows([r for rows in station_rows for r in rows])
+        print(f"[db] inserted={inserted} skipped={skipped}")
 
-            insert_pass_rows(station_rows)
+        # a replacing (--delete-existing / --changed-only) or incremental run leaves
+        # [window_start, end] complete for this TLE
+        if args.incremental or args.delete_existing or args.changed_only:
+            upsert_coverage(sat_id, sat["tle_id"], window_start, end)
 
-            if gi % 5 == 0 or gi == len(stations):
-                print(f"[gs {gi}/{len(stations)}] predicted={station_pred}")
+        mark_passes_generated([sat])
 
-    print("\n[done]")
+    cache = satrec_cache_info()
+    print(f"\n[cache] satrec hits={cache['hits']} misses={cache['misses']} size={cache['size']}")
+    print("[done]")
 
 
 if __name__ == "__main__":
@@ -6,8 +6,10 @@ from datetime import datetime, timedelta, timezone
 from psycopg.rows import dict_row
 
 from app.db.conn import get_conn
+from app.db.pass_writer import DELETE_OVERLAPPING_SQL, copy_passes
 from app.orbit.visibility import GroundStation
-from app.orbit.pass_prediction import predict_passes
+from app.orbit.pass_prediction import iter_passes
+from app.orbit.satrec_cache import satrec_cache_info
 
 
 def pick_latest_tle(cur, satellite_id: int | None):
@@ -46,6 +48,8 @@ def main():
     ap.add_argument("--hours", type=int, default=6, help="How many hours ahead to generate (default 6)")
     ap.add_argument("--step", type=int, default=30, help="Coarse step seconds for scanning (default 30)")
     ap.add_argument("--gs-limit", type=int, default=5, help="How many ground stations (default 5 for safe test)")
+    ap.add_argument("--mode", choices=["scalar", "vector", "adaptive"], default="vector", help="Coarse scan mode (default vector)")
+    ap.add_argument("--batch-size", type=int, default=500, help="Insert streamed passes in batches of N rows (default 500)")
     ap.add_argument("--delete-existing", action="store_true", help="Delete overlapping existing passes in window before inserting")
     args = ap.parse_args()
 
@@ -73,22 +77,23 @@ def main():
     print(f"[gs ] count={len(stations)}")
 
     total_pred = 0
-    total_inserted = 0
 
     with get_conn() as conn:
         with conn.cursor() as cur:
             if args.delete_existing:
-                cur.execute(
-                    """
-                    DELETE FROM passes
-                    WHERE satellite_id = %s
-                      AND start_ts < %s
-                      AND end_ts > %s
-                    """,
-                    (sat["satellite_id"], end, start),
-                )
+                cur.execute(DELETE_OVERLAPPING_SQL, {"sat": sat["satellite_id"], "start": start, "end": end})
                 print(f"[db] deleted_existing={cur.rowcount}")
 
+            rows: list[tuple] = []
+            written = {"inserted": 0, "skipped": 0}
+
+            def flush() -> None:
+                if rows:
+                    ins, skip = copy_passes(cur, rows)
+                    written["inserted"] += ins
+                    written["skipped"] += skip
+                    rows.clear()
+
             for idx, gs_row in enumerate(stations, start=1):
                 gs = GroundStation(
                     lat_deg=float(gs_row["lat"]),
@@ -96,7 +101,10 @@ def main():
                     alt_m=float(gs_row["alt_m"]),
                 )
 
-                passes = predict_passes(
+                # passes stream out as soon as their set time is refined;
+                # rows go to the DB in batches instead of after the whole window
+                n_pred = 0
+                for p in iter_passes(
                     line1=sat["line1"],
                     line2=sat["line2"],
                     gs=gs,
@@ -105,39 +113,32 @@ def main():
                     step_seconds=args.step,
                     cutoff_deg=0.0,
                     min_duration_s=5,
-                )
-
-                total_pred += len(passes)
-
-                # bulk insert for this GS
-                rows = [
-                    (
-                        sat["satellite_id"],
-                        gs_row["id"],
-                        p.start_ts,
-                        p.end_ts,
-                        p.duration_s,
-                        p.max_elev_deg,
+                    mode=args.mode,
+                ):
+                    rows.append(
+                        (
+                            sat["satellite_id"],
+                            gs_row["id"],
+                            p.start_ts,
+                            p.end_ts,
+                            p.duration_s,
+                            p.max_elev_deg,
+                        )
                     )
-                    for p in passes
-                ]
+                    n_pred += 1
+                    if len(rows) >= args.batch_size:
+                        flush()
 
-                if rows:
-                    cur.executemany(
-                        """
-                        INSERT INTO passes (satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (satellite_id, ground_station_id, start_ts, end_ts) DO NOTHING
-                        """,
-                        rows,
-                    )
-                    # executemany doesn't give exact rowcount reliably in psycopg,
-                    # so we just re-count per station by selecting after if needed later.
+                total_pred += n_pred
                 # approximate progress
-                if idx % 1 == 0:
-                    print(f"[prog] {idx}/{len(stations)} gs done | passes_pred={len(passes)}")
+                print(f"[prog] {idx}/{len(stations)} gs done | passes_pred={n_pred}")
+
+            flush()
+            print(f"[db] inserted={written['inserted']} skipped={written['skipped']}")
 
-    print(f"[done] total_predicted={total_pred} (inserted ~= {total_pred})")
+    cache = satrec_cache_info()
+    print(f"[cache] satrec hits={cache['hits']} misses={cache['misses']}")
+    print(f"[done] total_predicted={total_pred} inserted={written['inserted']}")
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 from psycopg.rows import dict_row
 
 from app.db.conn import get_conn
+from app.db.pass_writer import split_long_passes
 from app.orbit.visibility import GroundStation
 from app.orbit.pass_prediction import predict_passes
 
@@ -63,21 +64,18 @@ def main():
     inserted = 0
     with get_conn() as conn:
         with conn.cursor() as cur:
-            for p in passes:
+            rows = [
+                (sat["satellite_id"], gs_row["id"], p.start_ts, p.end_ts, p.duration_s, p.max_elev_deg)
+                for p in passes
+            ]
+            for row in split_long_passes(rows):
                 cur.execute(
                     """
-                    INSERT INTO passes (satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg)
-                    VALUES (%s, %s, %s, %s, %s, %s)
+                    INSERT INTO passes (satellite_id, ground_station_id, start_ts, end_ts, duration_s, max_elev_deg, pass_start)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
                     ON CONFLICT (satellite_id, ground_station_id, start_ts, end_ts) DO NOTHING
                     """,
-                    (
-                        sat["satellite_id"],
-                        gs_row["id"],
-                        p.start_ts,
-                        p.end_ts,
-                        p.duration_s,
-                        p.max_elev_deg,
-                    ),
+                    row,
                 )
                 inserted += cur.rowcount
 
@@ -0,0 +1,65 @@
+"""
+Keep passes partitions ahead of the generation horizon and drop expired ones.
+
+Run before each generation (or daily from cron):
+  py -3.12 -m app.scripts.maintain_pass_partitions --ahead-days 14 --retain-days 30
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from app.db.partitions import (
+    default_partition_rows,
+    drop_partitions_before,
+    ensure_partitions,
+    list_partition_days,
+    partition_name,
+)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ahead-days", type=int, default=14, help="Create partitions through today + N days (>= generation --days)")
+    ap.add_argument("--retain-days", type=int, default=30, help="Drop partitions for days before today - N (0 = keep everything)")
+    ap.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = ap.parse_args()
+
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=1)
+    last_day = today + timedelta(days=args.ahead_days)
+    cutoff = today - timedelta(days=args.retain_days) if args.retain_days > 0 else None
+
+    existing = list_partition_days()
+    print(
+        f"[parts] existing={len(existing)} "
+        f"| range={existing[0].isoformat() if existing else '-'} -> {existing[-1].isoformat() if existing else '-'}"
+    )
+
+    if args.dry_run:
+        have = set(existing)
+        missing = [
+            first_day + timedelta(days=k)
+            for k in range((last_day - first_day).days + 1)
+            if first_day + timedelta(days=k) not in have
+        ]
+        expired = [d for d in existing if cutoff is not None and d < cutoff]
+        print(f"[dry] would_create={len(missing)} would_drop={len(expired)}")
+        print(f"[default] rows={default_partition_rows()}")
+        return
+
+    created = ensure_partitions(first_day, last_day)
+    for day, moved in created:
+        print(f"[create] {partition_name(day)}" + (f" | moved_from_default={moved}" if moved else ""))
+
+    dropped = drop_partitions_before(cutoff) if cutoff is not None else []
+    for day in dropped:
+        print(f"[drop] {partition_name(day)}")
+
+    # rows here mean a write fell outside every day partition: widen --ahead-days
+    print(f"[default] rows={default_partition_rows()}")
+    print(f"[done] created={len(created)} dropped={len(dropped)}")
+
+
+if __name__ == "__main__":
+    main()
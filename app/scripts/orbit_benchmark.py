@@ -0,0 +1,311 @@
+"""
+Offline benchmark of the orbit engine on fixed inputs.
+
+TLEs come from docs/benchmarks/tle_fixtures.txt (LEO / MEO / GEO / HEO),
+stations from data/ground_stations.csv; no database needed. For every
+fixture and step size it measures:
+  propagate_tle     SGP4 evaluations/s (public per-datetime API)
+  elevation_deg     elevation evaluations/s (scalar API, every station)
+  elevation matrix  elevation evaluations/s (elevation_deg_matrix, vectorized)
+  predict_passes    passes/s over all stations (--mode), plus the pass count
+Each case also records its peak traced memory (tracemalloc, separate run so
+tracing does not skew the timings).
+
+Results are JSON (stdout summary + --out file) so runs on different commits
+can be compared; --baseline prints the ratios against an earlier file.
+
+  py -3.12 -m app.scripts.orbit_benchmark --steps 30,60,120 --out bench.json
+  py -3.12 -m app.scripts.orbit_benchmark --baseline bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import sgp4
+
+from app.orbit.pass_prediction import predict_passes
+from app.orbit.satrec_cache import clear_satrec_cache, get_satrec
+from app.orbit.sgp4_propagator import propagate_tle
+from app.orbit.timebase import SECONDS_PER_DAY, JulianEpoch
+from app.orbit.visibility import (
+    GroundStation,
+    clear_gmst_cache,
+    elevation_deg,
+    elevation_deg_matrix,
+    prepare_station,
+)
+
+
+TLE_FIXTURES_DEFAULT = Path("docs/benchmarks/tle_fixtures.txt")
+STATIONS_CSV_DEFAULT = Path("data/ground_stations.csv")
+START_DEFAULT = "2019-12-09T12:00:00+00:00"
+
+
+def load_tle_fixtures(path: Path) -> list[dict]:
+    """Three-line TLE file (name, line1, line2); '#' lines and blanks are skipped."""
+    if not path.exists():
+        raise RuntimeError(f"TLE fixtures not found: {path}")
+
+    lines = [
+        ln.rstrip()
+        for ln in path.read_text(encoding="utf-8").splitlines()
+        if ln.strip() and not ln.lstrip().startswith("#")
+    ]
+    if len(lines) % 3:
+        raise RuntimeError(f"{path}: expected name/line1/line2 triples")
+
+    out = []
+    for k in range(0, len(lines), 3):
+        name, line1, line2 = lines[k : k + 3]
+        if not (line1.startswith("1 ") and line2.startswith("2 ")):
+            raise RuntimeError(f"{path}: bad TLE for {name}")
+        get_satrec(line1, line2)  # fail early on a malformed set
+        out.append({"name": name.strip(), "line1": line1, "line2": line2})
+    return out
+
+
+def load_station_csv(path: Path) -> list[GroundStation]:
+    """Stations from the seed CSV (code,name,lat,lon,alt_m)."""
+    if not path.exists():
+        raise RuntimeError(f"CSV not found: {path}")
+    with path.open("r", newline="", encoding="utf-8") as f:
+        return [
+            GroundStation(lat_deg=float(r["lat"]), lon_deg=float(r["lon"]), alt_m=float(r["alt_m"] or 0.0))
+            for r in csv.DictReader(f)
+        ]
+
+
+def _best_of(fn, repeat: int):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(fn, repeat: int, fresh=None) -> tuple[float, int, object]:
+    """(best seconds, peak traced bytes, result); fresh() resets caches before each run."""
+    def run():
+        if fresh is not None:
+            fresh()
+        return fn()
+
+    seconds, out = _best_of(run, repeat)
+    return seconds, _peak_bytes(run), out
+
+
+def _clear_caches() -> None:
+    clear_satrec_cache()
+    clear_gmst_cache()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_fixture(
+    tle: dict,
+    stations: list[GroundStation],
+    start: datetime,
+    end: datetime,
+    step: int,
+    mode: str,
+    elev_samples: int,
+    repeat: int,
+) -> dict:
+    line1, line2 = tle["line1"], tle["line2"]
+    prepared = [prepare_station(gs) for gs in stations]
+
+    times = []
+    t = start
+    while t <= end:
+        times.append(t)
+        t += timedelta(seconds=step)
+    n_t = len(times)
+
+    # ---- SGP4 via propagate_tle ----
+    prop_s, prop_mem, states = _measure(lambda: propagate_tle(line1, line2, times), repeat, fresh=_clear_caches)
+
+    # ---- elevation_deg, scalar API; first elev_samples instants x every station ----
+    sub = states[:elev_samples]
+    elev_s, elev_mem, _ = _measure(
+        lambda: [elevation_deg(s.r_km, s.t, ps) for s in sub for ps in prepared], repeat
+    )
+    n_elev = len(sub) * len(prepared)
+
+    # ---- elevation_deg_matrix over the whole grid ----
+    sat = get_satrec(line1, line2)
+    ep = JulianEpoch.from_datetime(start)
+    jd = np.full(n_t, ep.jd)
+    fr = ep.fr + np.arange(n_t, dtype=float) * step / SECONDS_PER_DAY
+    _e, r, _v = sat.sgp4_array(jd, fr)
+    mat_s, mat_mem, _ = _measure(lambda: elevation_deg_matrix(r, jd, fr, prepared), repeat, fresh=clear_gmst_cache)
+
+    # ---- predict_passes over all stations ----
+    pp_s, pp_mem, passes = _measure(
+        lambda: [predict_passes(line1, line2, ps, start, end, step, mode=mode) for ps in prepared],
+        repeat,
+        fresh=_clear_caches,
+    )
+    n_passes = sum(len(p) for p in passes)
+
+    return {
+        "fixture": tle["name"],
+        "step_s": step,
+        "samples": n_t,
+        "propagate_tle": {
+            "seconds": prop_s,
+            "evals": n_t,
+            "evals_per_s": n_t / prop_s,
+            "peak_bytes": prop_mem,
+        },
+        "elevation_deg": {
+            "seconds": elev_s,
+            "evals": n_elev,
+            "evals_per_s": n_elev / elev_s if elev_s else None,
+            "peak_bytes": elev_mem,
+        },
+        "elevation_deg_matrix": {
+            "seconds": mat_s,
+            "evals": n_t * len(prepared),
+            "evals_per_s": n_t * len(prepared) / mat_s,
+            "peak_bytes": mat_mem,
+        },
+        "predict_passes": {
+            "mode": mode,
+            "seconds": pp_s,
+            "stations": len(prepared),
+            "passes": n_passes,
+            "passes_per_s": n_passes / pp_s,
+            "station_windows_per_s": len(prepared) / pp_s,
+            "peak_bytes": pp_mem,
+        },
+    }
+
+
+# metrics compared by --baseline; higher is better for rates, lower for memory
+_RATE_KEYS = [
+    ("propagate_tle", "evals_per_s"),
+    ("elevation_deg", "evals_per_s"),
+    ("elevation_deg_matrix", "evals_per_s"),
+    ("predict_passes", "passes_per_s"),
+    ("predict_passes", "station_windows_per_s"),
+]
+
+
+def compare(baseline: dict, current: dict) -> None:
+    base = {(c["fixture"], c["step_s"]): c for c in baseline["cases"]}
+    print(f"[compare] baseline={baseline['meta'].get('commit')} current={current['meta'].get('commit')}")
+    for c in current["cases"]:
+        b = base.get((c["fixture"], c["step_s"]))
+        if b is None:
+            continue
+        parts = []
+        for group, key in _RATE_KEYS:
+            old, new = b[group].get(key), c[group].get(key)
+            if old and new:
+                parts.append(f"{group}.{key}={new / old:.2f}x")
+        old_mem, new_mem = b["predict_passes"]["peak_bytes"], c["predict_passes"]["peak_bytes"]
+        if old_mem:
+            parts.append(f"predict_passes.peak_bytes={new_mem / old_mem:.2f}x")
+        print(f"[compare] {c['fixture']} step={c['step_s']} | " + " ".join(parts))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tles", default=str(TLE_FIXTURES_DEFAULT))
+    ap.add_argument("--stations", default=str(STATIONS_CSV_DEFAULT))
+    ap.add_argument("--start", default=START_DEFAULT, help="ISO UTC start (fixture epochs are 2019-12-09)")
+    ap.add_argument("--days", type=float, default=7.0)
+    ap.add_argument("--steps", default="30,60,120", help="Comma-separated step sizes in seconds")
+    ap.add_argument("--mode", choices=["scalar", "vector", "adaptive"], default="vector")
+    ap.add_argument("--elev-samples", type=int, default=2000, help="Instants for the scalar elevation_deg loop")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept)")
+    ap.add_argument("--only", default=None, help="Comma-separated fixture names")
+    ap.add_argument("--out", default=None, help="Write the JSON report here")
+    ap.add_argument("--baseline", default=None, help="Earlier JSON report to compare against")
+    args = ap.parse_args()
+
+    tles = load_tle_fixtures(Path(args.tles))
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",")}
+        tles = [t for t in tles if t["name"] in wanted]
+    stations = load_station_csv(Path(args.stations))
+    steps = [int(s) for s in args.steps.split(",") if s.strip()]
+    start = datetime.fromisoformat(args.start).astimezone(timezone.utc)
+    end = start + timedelta(days=args.days)
+
+    print(f"[bench] fixtures={len(tles)} stations={len(stations)} steps={steps} mode={args.mode} | {start.isoformat()} -> {end.isoformat()}")
+
+    cases = []
+    for tle in tles:
+        for step in steps:
+            c = bench_fixture(tle, stations, start, end, step, args.mode, args.elev_samples, args.repeat)
+            cases.append(c)
+            print(
+                f"[case] {c['fixture']:<12} step={step:>4}s | "
+                f"sgp4={c['propagate_tle']['evals_per_s']:,.0f}/s | "
+                f"elev={c['elevation_deg']['evals_per_s']:,.0f}/s | "
+                f"elev_matrix={c['elevation_deg_matrix']['evals_per_s']:,.0f}/s | "
+                f"passes={c['predict_passes']['passes']} ({c['predict_passes']['passes_per_s']:,.0f}/s) | "
+                f"peak={c['predict_passes']['peak_bytes'] / 2**20:.1f} MiB"
+            )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sgp4": sgp4.__version__,
+            "platform": platform.platform(),
+            "start": start.isoformat(),
+            "days": args.days,
+            "steps": steps,
+            "mode": args.mode,
+            "stations": len(stations),
+            "elev_samples": args.elev_samples,
+            "repeat": args.repeat,
+        },
+        "cases": cases,
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[out] {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+    print("[done]")
+
+
+if __name__ == "__main__":
+    main()
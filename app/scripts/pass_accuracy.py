@@ -0,0 +1,225 @@
+"""
+Accuracy vs speed of pass prediction settings, against a dense reference.
+
+The reference is predict_passes (vector) at --ref-step (default 1 s) with a
+tight rise/set tolerance; every candidate "mode:step[:refine_tol_s]" is run
+through the same per-(fixture, station) predict_passes calls and matched to it:
+  missed     reference passes with no overlapping candidate pass
+  spurious   candidate passes with no overlapping reference pass
+  rise/set   candidate - reference start/end (s): mean, |err| p50/p95/p99/max
+  max_elev   candidate - reference max elevation (deg), same stats
+  runtime    candidate seconds, and speedup over the reference
+Inputs are the benchmark fixtures (see orbit_benchmark); no database needed.
+
+  py -3.12 -m app.scripts.pass_accuracy --days 1 --candidates vector:30,vector:60,vector:120,adaptive:60 --out acc.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from app.orbit.pass_prediction import DEFAULT_REFINE_TOL_S, PassWindow, predict_passes
+from app.orbit.visibility import prepare_station
+from app.scripts.orbit_benchmark import (
+    START_DEFAULT,
+    STATIONS_CSV_DEFAULT,
+    TLE_FIXTURES_DEFAULT,
+    git_commit,
+    load_station_csv,
+    load_tle_fixtures,
+)
+
+
+REF_REFINE_TOL_S = 1e-6
+
+
+def parse_candidate(spec: str) -> dict:
+    """'vector:60' or 'scalar:120:0.01' -> {mode, step, refine_tol_s, label}."""
+    parts = spec.strip().split(":")
+    if len(parts) not in (2, 3) or parts[0] not in ("scalar", "vector", "adaptive"):
+        raise ValueError(f"bad candidate {spec!r}; expected mode:step[:refine_tol_s]")
+    tol = float(parts[2]) if len(parts) == 3 else DEFAULT_REFINE_TOL_S
+    return {"mode": parts[0], "step": int(parts[1]), "refine_tol_s": tol, "label": spec.strip()}
+
+
+def match_passes(ref: list[PassWindow], got: list[PassWindow]) -> tuple[list[tuple[PassWindow, PassWindow]], int, int]:
+    """
+    Pair each reference pass with the overlapping candidate pass (largest
+    overlap wins; each candidate is used at most once). Both lists are sorted
+    by start_ts. Returns (pairs, missed, spurious).
+    """
+    pairs = []
+    used = [False] * len(got)
+    j0 = 0
+    for r in ref:
+        while j0 < len(got) and got[j0].end_ts <= r.start_ts:
+            j0 += 1
+        best, best_overlap = None, 0.0
+        j = j0
+        while j < len(got) and got[j].start_ts < r.end_ts:
+            if not used[j]:
+                overlap = (min(r.end_ts, got[j].end_ts) - max(r.start_ts, got[j].start_ts)).total_seconds()
+                if overlap > best_overlap:
+                    best, best_overlap = j, overlap
+            j += 1
+        if best is not None:
+            used[best] = True
+            pairs.append((r, got[best]))
+    return pairs, len(ref) - len(pairs), used.count(False)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {"n": 0}
+    a = np.asarray(values, dtype=float)
+    absa = np.abs(a)
+    return {
+        "n": int(a.size),
+        "mean": float(a.mean()),
+        "abs_p50": float(np.percentile(absa, 50)),
+        "abs_p95": float(np.percentile(absa, 95)),
+        "abs_p99": float(np.percentile(absa, 99)),
+        "abs_max": float(absa.max()),
+    }
+
+
+def evaluate(candidate: dict, tles: list[dict], prepared: list, reference: dict, start: datetime, end: datetime) -> dict:
+    rise, sset, elev = [], [], []
+    missed = spurious = n_ref = n_got = 0
+    missed_durations = []
+    seconds = 0.0
+
+    for tle in tles:
+        for gi, ps in enumerate(prepared):
+            t0 = time.perf_counter()
+            got = predict_passes(
+                tle["line1"],
+                tle["line2"],
+                ps,
+                start,
+                end,
+                candidate["step"],
+                mode=candidate["mode"],
+                refine_tol_s=candidate["refine_tol_s"],
+            )
+            seconds += time.perf_counter() - t0
+
+            ref = reference[tle["name"]][gi]
+            pairs, m, s = match_passes(ref, got)
+            missed += m
+            spurious += s
+            n_ref += len(ref)
+            n_got += len(got)
+            matched = {id(r) for r, _g in pairs}
+            missed_durations.extend(r.duration_s for r in ref if id(r) not in matched)
+            for r, g in pairs:
+                rise.append((g.start_ts - r.start_ts).total_seconds())
+                sset.append((g.end_ts - r.end_ts).total_seconds())
+                elev.append(g.max_elev_deg - r.max_elev_deg)
+
+    return {
+        "candidate": candidate["label"],
+        "mode": candidate["mode"],
+        "step_s": candidate["step"],
+        "refine_tol_s": candidate["refine_tol_s"],
+        "seconds": seconds,
+        "reference_passes": n_ref,
+        "passes": n_got,
+        "missed": missed,
+        "spurious": spurious,
+        "missed_max_duration_s": max(missed_durations, default=0),
+        "rise_error_s": _stats(rise),
+        "set_error_s": _stats(sset),
+        "max_elev_error_deg": _stats(elev),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tles", default=str(TLE_FIXTURES_DEFAULT))
+    ap.add_argument("--stations", default=str(STATIONS_CSV_DEFAULT))
+    ap.add_argument("--gs-limit", type=int, default=None, help="Use only the first N stations")
+    ap.add_argument("--only", default=None, help="Comma-separated fixture names")
+    ap.add_argument("--start", default=START_DEFAULT, help="ISO UTC start (fixture epochs are 2019-12-09)")
+    ap.add_argument("--days", type=float, default=1.0)
+    ap.add_argument("--ref-step", type=int, default=1)
+    ap.add_argument("--ref-tol-s", type=float, default=REF_REFINE_TOL_S)
+    ap.add_argument(
+        "--candidates",
+        default="scalar:30,vector:30,vector:60,vector:120,vector:300,adaptive:60",
+        help="Comma-separated mode:step[:refine_tol_s]",
+    )
+    ap.add_argument("--out", default=None, help="Write the JSON report here")
+    args = ap.parse_args()
+
+    tles = load_tle_fixtures(Path(args.tles))
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",")}
+        tles = [t for t in tles if t["name"] in wanted]
+    stations = load_station_csv(Path(args.stations))[: args.gs_limit]
+    prepared = [prepare_station(gs) for gs in stations]
+    candidates = [parse_candidate(c) for c in args.candidates.split(",") if c.strip()]
+    start = datetime.fromisoformat(args.start).astimezone(timezone.utc)
+    end = start + timedelta(days=args.days)
+
+    # ---- dense reference: timed through the same per-station calls as the candidates ----
+    t0 = time.perf_counter()
+    reference = {
+        tle["name"]: [
+            predict_passes(
+                tle["line1"], tle["line2"], ps, start, end, args.ref_step, mode="vector", refine_tol_s=args.ref_tol_s
+            )
+            for ps in prepared
+        ]
+        for tle in tles
+    }
+    ref_s = time.perf_counter() - t0
+    n_ref = sum(len(p) for per_gs in reference.values() for p in per_gs)
+    print(
+        f"[ref] fixtures={len(tles)} stations={len(prepared)} step={args.ref_step}s tol={args.ref_tol_s}s "
+        f"| passes={n_ref} | {ref_s:.2f}s | {start.isoformat()} -> {end.isoformat()}"
+    )
+
+    results = []
+    for cand in candidates:
+        r = evaluate(cand, tles, prepared, reference, start, end)
+        r["speedup_vs_ref"] = ref_s / r["seconds"] if r["seconds"] else None
+        results.append(r)
+        print(
+            f"[cand] {r['candidate']:<16} | {r['seconds']:.2f}s ({r['speedup_vs_ref']:.1f}x ref) | passes={r['passes']} "
+            f"missed={r['missed']} (max {r['missed_max_duration_s']}s) spurious={r['spurious']} "
+            f"| rise p95={r['rise_error_s'].get('abs_p95', 0.0) * 1e3:.1f}ms max={r['rise_error_s'].get('abs_max', 0.0) * 1e3:.1f}ms "
+            f"| set p95={r['set_error_s'].get('abs_p95', 0.0) * 1e3:.1f}ms max={r['set_error_s'].get('abs_max', 0.0) * 1e3:.1f}ms "
+            f"| max_elev p95={r['max_elev_error_deg'].get('abs_p95', 0.0):.3f}deg"
+        )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "start": start.isoformat(),
+            "days": args.days,
+            "fixtures": [t["name"] for t in tles],
+            "stations": len(prepared),
+            "ref_step_s": args.ref_step,
+            "ref_refine_tol_s": args.ref_tol_s,
+            "ref_seconds": ref_s,
+            "ref_passes": n_ref,
+        },
+        "candidates": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[out] {args.out}")
+
+    print("[done]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Pass-generation worker for the pass_jobs queue.
+
+Run any number of these (on one or many machines) against the same database:
+each claims one (satellite, chunk) job at a time with FOR UPDATE SKIP LOCKED,
+predicts passes for all ground stations and writes them together with the job
+status. A background thread keeps heartbeat_at fresh; jobs whose heartbeat
+goes stale (worker killed, machine lost) are requeued by whichever worker
+sweeps next.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import threading
+import time
+
+from app.db.pass_jobs import claim_job, complete_job, fail_job, heartbeat, job_progress, requeue_stale_jobs
+from app.orbit.satrec_cache import satrec_cache_info
+from app.orbit.station_index import StationIndex
+from app.scripts.generate_passes_7d_batched import (
+    build_prepared_stations,
+    load_ground_stations,
+    load_tle,
+    predict_chunk_rows,
+)
+
+
+class _Heartbeat(threading.Thread):
+    """Refreshes the claimed job's heartbeat every `interval_s` until stopped."""
+
+    def __init__(self, job_id: int, worker: str, interval_s: float):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.worker = worker
+        self.interval_s = interval_s
+        self.lost = False
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        while not self._halt.wait(self.interval_s):
+            try:
+                if not heartbeat(self.job_id, self.worker):
+                    self.lost = True
+                    return
+            except Exception as e:
+                # a missed beat is not fatal; the stale timeout is several intervals
+                print(f"[hb] job={self.job_id} error={e}")
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Claim and run pass_jobs until the queue is empty")
+    ap.add_argument("--gs-limit", type=int, default=50)
+    ap.add_argument("--step", type=int, default=60, help="Coarse scan step seconds (default 60)")
+    ap.add_argument("--mode", choices=["scalar", "vector", "adaptive"], default="vector")
+    ap.add_argument("--prefilter", action="store_true", help="vector mode: KD-tree station prefilter")
+    ap.add_argument("--heartbeat-s", type=float, default=15.0, help="Heartbeat interval seconds (default 15)")
+    ap.add_argument("--stale-after-s", type=int, default=120, help="Requeue running jobs with no heartbeat for this long (default 120)")
+    ap.add_argument("--max-attempts", type=int, default=3, help="Mark a job failed after this many attempts (default 3)")
+    ap.add_argument("--max-jobs", type=int, default=0, help="Stop after N jobs (default 0 = until queue is empty)")
+    ap.add_argument("--wait", action="store_true", help="Keep polling when the queue is empty instead of exiting")
+    ap.add_argument("--poll-s", type=float, default=5.0, help="Poll interval with --wait (default 5)")
+    args = ap.parse_args()
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    stations = load_ground_stations(args.gs_limit)
+    stations_gs = build_prepared_stations(stations)
+    index = StationIndex(station_ids=[r["id"] for r in stations], stations=stations_gs) if args.prefilter else None
+
+    print(f"[worker] {worker} | gs={len(stations)} | step={args.step}s | mode={args.mode}")
+
+    done_jobs = 0
+    total_passes = 0
+    t0 = time.perf_counter()
+
+    while not args.max_jobs or done_jobs < args.max_jobs:
+        requeued, failed = requeue_stale_jobs(args.stale_after_s, args.max_attempts)
+        if requeued or failed:
+            print(f"[sweep] requeued={requeued} failed={failed}")
+
+        job = claim_job(worker)
+        if job is None:
+            if not args.wait:
+                break
+            time.sleep(args.poll_s)
+            continue
+
+        hb = _Heartbeat(job["id"], worker, args.heartbeat_s)
+        hb.start()
+        job_t0 = time.perf_counter()
+        try:
+            # the TLE the job was planned with, even if a newer one arrived since
+            sat = load_tle(job["tle_id"])
+            chunk_rows = predict_chunk_rows(
+                sat,
+                stations,
+                stations_gs,
+                job["chunk_start"],
+                job["chunk_end"],
+                job["window_end"],
+                args.step,
+                args.mode,
+                index,
+            )
+            rows = [r for station_rows in chunk_rows for r in station_rows]
+        except Exception as e:
+            hb.stop()
+            fail_job(job, worker, repr(e), args.max_attempts)
+            print(f"[job {job['id']}] sat={job['satellite_id']} attempt={job['attempts']} error={e!r}")
+            continue
+
+        hb.stop()
+        if hb.lost or not complete_job(job, worker, rows):
+            # requeued by a sweep while we were computing; the new owner writes it
+            print(f"[job {job['id']}] lost ownership, result discarded")
+            continue
+
+        done_jobs += 1
+        total_passes += len(rows)
+        print(
+            f"[job {job['id']}] sat={job['satellite_id']} {job['chunk_start'].isoformat()} "
+            f"passes={len(rows)} | {time.perf_counter() - job_t0:.1f}s"
+        )
+
+    wall = time.perf_counter() - t0
+    cache = satrec_cache_info()
+    print(f"\n[worker] {worker} jobs={done_jobs} passes={total_passes} wall={wall:.1f}s")
+    print(f"[cache] satrec hits={cache['hits']} misses={cache['misses']} size={cache['size']}")
+    for p in job_progress():
+        print(f"[queue] {p['window_start'].isoformat()} done={p['done']}/{p['jobs']} failed={p['failed']} ({p['pct_done']}%)")
+    print("[done]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from app.db.pass_jobs import job_progress, plan_jobs
+from app.scripts.generate_passes_7d_batched import load_latest_tles, utcnow
+
+
+def snap_to_grid(ts: datetime, chunk_hours: int, up: bool = False) -> datetime:
+    """Floor (or ceil) ts to a multiple of chunk_hours since the Unix epoch (UTC)."""
+    width = chunk_hours * 3600
+    epoch_s = ts.timestamp()
+    n = -(-epoch_s // width) if up else epoch_s // width
+    return datetime.fromtimestamp(n * width, tz=timezone.utc)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fill the pass_jobs queue with (satellite, time chunk) jobs")
+    ap.add_argument("--days", type=int, default=7)
+    ap.add_argument("--satellite-id", type=int, default=None, help="Plan one satellite id (DB id)")
+    ap.add_argument("--sat-limit", type=int, default=1, help="How many satellites to plan (default 1)")
+    ap.add_argument("--chunk-hours", type=int, default=24, help="Job size in hours (default 24h)")
+    args = ap.parse_args()
+
+    # chunk boundaries sit on a fixed chunk_hours grid, so any re-plan reuses the
+    # same (satellite, chunk_start, chunk_end) keys instead of adding a shifted,
+    # overlapping chunk set whose deletes would miss the other set's passes
+    now = utcnow()
+    start = snap_to_grid(now, args.chunk_hours)
+    end = snap_to_grid(now + timedelta(days=args.days), args.chunk_hours, up=True)
+
+    sats = load_latest_tles(args.sat_limit, args.satellite_id)
+    created, repinned = plan_jobs([(s["satellite_id"], s["tle_id"]) for s in sats], start, end, args.chunk_hours)
+
+    print(f"[win] {start.isoformat()} -> {end.isoformat()} | days={args.days}")
+    print(f"[plan] sats={len(sats)} | chunk_hours={args.chunk_hours} | new_jobs={created} repinned_to_new_tle={repinned}")
+
+    for p in job_progress():
+        print(
+            f"[queue] {p['window_start'].isoformat()} jobs={p['jobs']} pending={p['pending']} "
+            f"running={p['running']} done={p['done']} failed={p['failed']}"
+        )
+
+
+if __name__ == "__main__":
+    main()